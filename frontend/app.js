@@ -193,16 +193,9 @@ class TerminalApp {
         };
 
         this.ws.onmessage = (event) => {
-            if (typeof event.data === 'string') {
-                if (event.data === '__TERMINAL_CLOSED__') {
-                    this.term.writeln('\r\n\x1b[1;31m[Terminal session closed]\x1b[0m');
-                    this.disconnect();
-                }
-            } else {
-                // Binary data (terminal output)
-                const text = new TextDecoder().decode(event.data);
-                this.term.write(text);
-            }
+            // Binary data (terminal output)
+            const text = new TextDecoder().decode(event.data);
+            this.term.write(text);
         };
 
         this.ws.onerror = (error) => {
@@ -210,10 +203,16 @@ class TerminalApp {
             this.setStatus('Connection error', 'error');
         };
 
-        this.ws.onclose = () => {
+        this.ws.onclose = (event) => {
             this.setStatus('Disconnected', 'error');
             document.getElementById('disconnectBtn').disabled = true;
             this.ws = null;
+
+            // Close code 4000: the terminal process exited
+            if (event.code === 4000) {
+                this.term.writeln('\r\n\x1b[1;31m[Terminal session closed]\x1b[0m');
+                this.disconnect();
+            }
         };
     }
 
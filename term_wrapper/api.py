@@ -4,13 +4,13 @@ import asyncio
 import os
 import re
 from pathlib import Path
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import Optional
-from .session_manager import SessionManager
+from .session_manager import SessionManager, TerminalSession
 
 # Get package version
 try:
@@ -48,6 +48,9 @@ app.add_middleware(
 
 session_manager = SessionManager()
 
+# Most seconds POST /sessions waits for output when return_initial is set
+INITIAL_OUTPUT_TIMEOUT = 0.5
+
 
 class CreateSessionRequest(BaseModel):
     """Request model for creating a session."""
@@ -56,6 +59,7 @@ class CreateSessionRequest(BaseModel):
     rows: int = 24
     cols: int = 80
     env: Optional[dict] = None
+    return_initial: bool = False
 
 
 class WriteInputRequest(BaseModel):
@@ -75,11 +79,16 @@ class ResizeRequest(BaseModel):
 async def create_session(request: CreateSessionRequest) -> JSONResponse:
     """Create a new terminal session.
 
+    With request.return_initial set, the response waits for the first
+    output (up to INITIAL_OUTPUT_TIMEOUT) and includes it, so a client can
+    skip its first output poll.
+
     Args:
         request: Session creation request
 
     Returns:
-        JSON response with session_id
+        JSON response with session_id, plus initial_output (not cleared
+        from the buffer) when request.return_initial is set
     """
     session_id = session_manager.create_session(
         command=request.command,
@@ -93,6 +102,12 @@ async def create_session(request: CreateSessionRequest) -> JSONResponse:
         # Start reading from terminal
         await session.terminal.start_reading()
 
+    if request.return_initial and session:
+        output = await session.wait_for_output(INITIAL_OUTPUT_TIMEOUT)
+        return JSONResponse({
+            "session_id": session_id,
+            "initial_output": output.decode("utf-8", errors="replace"),
+        })
     return JSONResponse({"session_id": session_id})
 
 
@@ -155,6 +170,22 @@ async def delete_session(session_id: str) -> JSONResponse:
     return JSONResponse({"status": "deleted"})
 
 
+def _write_input(session: TerminalSession, data: bytes) -> None:
+    """Write input to a session's terminal.
+
+    Args:
+        session: Terminal session
+        data: Input bytes
+
+    Raises:
+        HTTPException: 503 if the terminal's input buffer is full
+    """
+    try:
+        session.terminal.write(data)
+    except BlockingIOError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 @app.post("/sessions/{session_id}/input")
 async def write_input(session_id: str, request: WriteInputRequest) -> JSONResponse:
     """Write input to terminal session.
@@ -167,13 +198,40 @@ async def write_input(session_id: str, request: WriteInputRequest) -> JSONRespon
         JSON response with success status
 
     Raises:
-        HTTPException: If session not found
+        HTTPException: If session not found, or 503 if the process has
+            stopped reading its input and too much is queued
     """
     session = session_manager.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session.terminal.write(request.data.encode())
+    _write_input(session, request.data.encode())
+    return JSONResponse({"status": "ok"})
+
+
+@app.post("/sessions/{session_id}/input_raw")
+async def write_input_raw(session_id: str, request: Request) -> JSONResponse:
+    """Write the raw request body to a terminal session.
+
+    Unlike /input, the body is written to the PTY as-is, with no JSON or
+    text decoding in between.
+
+    Args:
+        session_id: Session identifier
+        request: Request whose body holds the input bytes
+
+    Returns:
+        JSON response with success status
+
+    Raises:
+        HTTPException: If session not found, or 503 if the process has
+            stopped reading its input and too much is queued
+    """
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    _write_input(session, await request.body())
     return JSONResponse({"status": "ok"})
 
 
@@ -200,15 +258,70 @@ async def resize_terminal(session_id: str, request: ResizeRequest) -> JSONRespon
 
 
 @app.get("/sessions/{session_id}/output")
-async def get_output(session_id: str, clear: bool = True) -> JSONResponse:
+async def get_output(
+    session_id: str,
+    clear: bool = True,
+    raw: bool = False,
+    offset: Optional[int] = None,
+    base: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """Get terminal output.
 
+    Non-clearing reads carry an ETag of the form "start-end": the stream
+    offsets of the buffered output. Sending it back in If-None-Match yields
+    an empty 304 response while the buffer is unchanged.
+
     Args:
         session_id: Session identifier
         clear: Whether to clear buffer after reading
+        raw: Return the undecoded output bytes instead of JSON
+        offset: For non-clearing reads, only return output from this stream
+            offset on; the X-Output-Offset header holds the offset actually used
+        base: Stream offset where the caller's copy of the buffer begins; if
+            the buffer was cleared since, the whole buffer is returned
+        if_none_match: ETag from a previous non-clearing read
+
+    Returns:
+        JSON response with output data, or raw bytes if requested
+
+    Raises:
+        HTTPException: If session not found
+    """
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    headers = {}
+    if clear:
+        output = await session.get_output(clear=True)
+    else:
+        etag = f'"{session.output_start}-{session.output_end}"'
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        start, data_offset, output = await session.get_output_from(
+            session.output_start if offset is None else offset, base
+        )
+        headers["ETag"] = f'"{start}-{data_offset + len(output)}"'
+        if offset is not None:
+            headers["X-Output-Offset"] = str(data_offset)
+
+    if raw:
+        return Response(content=output, media_type="application/octet-stream", headers=headers)
+    return JSONResponse({"output": output.decode("utf-8", errors="replace")}, headers=headers)
+
+
+@app.get("/sessions/{session_id}/quiet")
+async def wait_for_quiet(session_id: str, duration: float = 2.0, timeout: float = 30.0) -> dict:
+    """Wait until a session has produced no output for a while.
+
+    Args:
+        session_id: Session identifier
+        duration: Seconds without output required
+        timeout: Maximum seconds to wait
 
     Returns:
-        JSON response with output data
+        Whether the session went quiet before the timeout
 
     Raises:
         HTTPException: If session not found
@@ -217,12 +330,11 @@ async def get_output(session_id: str, clear: bool = True) -> JSONResponse:
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    output = await session.get_output(clear=clear)
-    return JSONResponse({"output": output.decode("utf-8", errors="replace")})
+    return {"quiet": await session.wait_for_quiet(duration, timeout)}
 
 
 @app.get("/sessions/{session_id}/screen")
-async def get_screen(session_id: str) -> JSONResponse:
+async def get_screen(session_id: str, if_none_match: Optional[str] = Header(None)) -> Response:
     """Get rendered terminal screen as 2D array.
 
     This endpoint provides a parsed view of the terminal screen,
@@ -230,8 +342,13 @@ async def get_screen(session_id: str) -> JSONResponse:
     produce a 2D grid of characters. This is useful for parsing
     complex TUI applications like htop, vim, etc.
 
+    The response carries the screen version as its ETag; sending it back
+    in If-None-Match yields an empty 304 response while the screen is
+    unchanged, skipping rendering and serialization.
+
     Args:
         session_id: Session identifier
+        if_none_match: ETag from a previous screen read
 
     Returns:
         JSON response with:
@@ -247,6 +364,11 @@ async def get_screen(session_id: str) -> JSONResponse:
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
+    etag = f'"{session.screen_version}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    session.update_screen()
     lines = session.screen_buffer.get_screen_lines()
 
     return JSONResponse({
@@ -257,7 +379,20 @@ async def get_screen(session_id: str) -> JSONResponse:
             "row": session.screen_buffer.cursor_row,
             "col": session.screen_buffer.cursor_col
         }
-    })
+    }, headers={"ETag": etag})
+
+
+# WebSocket close code sent on /ws when the terminal process exits
+TERMINAL_CLOSED_CODE = 4000
+
+# WebSocket close code sent on /stream when the client fell too far behind
+STREAM_OVERFLOW_CODE = 4001
+
+# Synchronized output mode (DEC 2026): ESC[?2026h enables, ESC[?2026l disables
+_SYNC_OUTPUT_RE = re.compile(r'\x1b\[\?2026[hl]')
+
+# Non-standard ESC[<u sequence that xterm.js doesn't handle
+_KITTY_POP_RE = re.compile(r'\x1b\[<u')
 
 
 def filter_unsupported_ansi(data: bytes) -> bytes:
@@ -278,11 +413,11 @@ def filter_unsupported_ansi(data: bytes) -> bytes:
     # Remove synchronized output mode sequences (DEC 2026)
     # ESC[?2026h - Enable synchronized output
     # ESC[?2026l - Disable synchronized output
-    text = re.sub(r'\x1b\[\?2026[hl]', '', text)
+    text = _SYNC_OUTPUT_RE.sub('', text)
 
     # Remove ESC[<u sequence which appears frequently and may cause rendering issues
     # This is not a standard terminal escape sequence and xterm.js doesn't handle it
-    text = re.sub(r'\x1b\[<u', '', text)
+    text = _KITTY_POP_RE.sub('', text)
 
     # Convert back to bytes
     return text.encode('utf-8', errors='replace')
@@ -315,7 +450,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                     await websocket.send_bytes(filtered_output)
 
                 if not session.terminal.is_alive():
-                    await websocket.send_text("__TERMINAL_CLOSED__")
+                    await websocket.close(code=TERMINAL_CLOSED_CODE, reason="terminal_closed")
                     break
             except WebSocketDisconnect:
                 break
@@ -348,6 +483,48 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             pass
 
 
+@app.websocket("/sessions/{session_id}/stream")
+async def stream_endpoint(websocket: WebSocket, session_id: str):
+    """Receive-only WebSocket pushing terminal output as it is produced.
+
+    Unlike /ws, this does not consume the output buffer: it first sends the
+    currently buffered output, then every new chunk, and closes once the
+    terminal stops producing output. A client that stops reading is
+    disconnected with STREAM_OVERFLOW_CODE instead of buffering without bound.
+
+    Args:
+        websocket: WebSocket connection
+        session_id: Session identifier
+    """
+    session = session_manager.get_session(session_id)
+    if not session:
+        await websocket.close(code=1008, reason="Session not found")
+        return
+
+    await websocket.accept()
+    snapshot, queue = session.subscribe()
+    try:
+        if snapshot:
+            await websocket.send_bytes(snapshot)
+        while True:
+            data = await queue.get()
+            if data is None:
+                await websocket.close(code=STREAM_OVERFLOW_CODE, reason="stream_overflow")
+                break
+            if not data:
+                # The terminal stopped producing output
+                break
+            await websocket.send_bytes(data)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.unsubscribe(queue)
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
 @app.get("/health")
 async def health_check() -> JSONResponse:
     """Health check endpoint.
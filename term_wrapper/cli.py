@@ -1,18 +1,348 @@
 """CLI client for terminal wrapper."""
 
-import asyncio
+import codecs
+import importlib.util
+from abc import ABC, abstractmethod
+import os
+import re
+import select
 import sys
-import termios
-import tty
+import threading
 import time
 import webbrowser
-from typing import Optional, Callable
+from typing import TYPE_CHECKING, Optional, Callable
 import httpx
-import websockets
 import json
-from .utils import strip_ansi, extract_visible_text
+import urllib.parse
+import warnings
+from .utils import strip_ansi_bytes, incomplete_ansi_start, extract_visible_text
 from .server_manager import ServerManager
 
+if TYPE_CHECKING:
+    # Imported inside the functions that use it, to keep CLI startup fast
+    import asyncio
+
+# Wait loops start polling this fast and back off towards poll_interval
+MIN_POLL_INTERVAL = 0.02
+
+# Most stdin bytes forwarded in one WebSocket frame during attach
+STDIN_READ_SIZE = 4096
+
+# Linux IOV_MAX: most buffers a single writev() call accepts
+_IOV_MAX = 1024
+
+# Connection pool shared by the sync and async HTTP clients. Idle connections
+# are kept for a minute so wait loops and repeated calls skip reconnecting.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=8, max_connections=16, keepalive_expiry=60.0)
+
+# HTTP/2 is negotiated over TLS only and needs the optional h2 package
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Close code of a /stream connection the server dropped for falling behind
+# (api.STREAM_OVERFLOW_CODE; not imported to keep the server out of the CLI)
+_STREAM_OVERFLOW_CODE = 4001
+
+# Session IDs are lowercase UUID4 strings
+_UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+
+def _next_interval(interval: float, changed: bool, poll_interval: float) -> float:
+    """Compute the next adaptive poll interval.
+
+    The interval resets to MIN_POLL_INTERVAL whenever output changed and
+    grows by 1.5x up to poll_interval while it stays the same.
+
+    Args:
+        interval: Interval used for the previous sleep
+        changed: Whether the last poll saw new output
+        poll_interval: Upper bound for the interval
+
+    Returns:
+        The next interval
+    """
+    return MIN_POLL_INTERVAL if changed else min(interval * 1.5, poll_interval)
+
+
+async def _backoff_sleep(interval: float, changed: bool, poll_interval: float,
+                         deadline: float) -> float:
+    """Sleep for the next adaptive poll interval.
+
+    Args:
+        interval: Interval used for the previous sleep
+        changed: Whether the last poll saw new output
+        poll_interval: Upper bound for the interval
+        deadline: time.monotonic() value past which there is no point sleeping
+
+    Returns:
+        The interval that was used
+    """
+    import asyncio
+
+    interval = _next_interval(interval, changed, poll_interval)
+    await asyncio.sleep(max(0.0, min(interval, deadline - time.monotonic())))
+    return interval
+
+
+def _contains_needle(needle: bytes, data: bytes, strip_ansi_codes: bool) -> bool:
+    """Check whether output bytes contain a needle.
+
+    Args:
+        needle: Bytes to look for
+        data: Raw output bytes
+        strip_ansi_codes: Whether to match against the ANSI-stripped output
+
+    Returns:
+        True if the needle was found
+    """
+    if not strip_ansi_codes:
+        return needle in data
+    # A needle without ESC found in the raw output is almost always a
+    # match in the stripped view too (unless it sits inside an escape
+    # sequence's parameters), so try the cheap raw match first
+    if b'\x1b' not in needle and needle in data:
+        return True
+    return needle in strip_ansi_bytes(data)
+
+
+def _parse_etag(etag: str) -> tuple[int, int]:
+    """Split an output ETag ("start-end") into its stream offsets."""
+    start, end = etag.strip('"').split('-')
+    return int(start), int(end)
+
+
+def _quiet_result(response: httpx.Response, timeout: float) -> bool:
+    """Interpret a response from the /quiet endpoint.
+
+    Args:
+        response: Response from the /quiet endpoint
+        timeout: Timeout the request was made with, for the error message
+
+    Returns:
+        True if the session went quiet
+
+    Raises:
+        TimeoutError: If the session did not go quiet in time
+    """
+    response.raise_for_status()
+    if not response.json()["quiet"]:
+        raise TimeoutError(f"Output did not stabilize within {timeout} seconds")
+    return True
+
+
+def _leaf_exceptions(group: BaseExceptionGroup) -> list[BaseException]:
+    """Flatten a (possibly nested) exception group into its leaf exceptions.
+
+    Args:
+        group: Exception group raised by a task group
+
+    Returns:
+        The non-group exceptions it contains, in order
+    """
+    leaves = []
+    for exc in group.exceptions:
+        if isinstance(exc, BaseExceptionGroup):
+            leaves.extend(_leaf_exceptions(exc))
+        else:
+            leaves.append(exc)
+    return leaves
+
+
+async def _close_on_cancel(client: httpx.AsyncClient) -> None:
+    """Keep an async HTTP client open until this task is cancelled, then close it.
+
+    asyncio.run() cancels leftover tasks before closing its loop, so the
+    client is closed on the loop it belongs to even without an aclose().
+
+    Args:
+        client: Client to close
+    """
+    import asyncio
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await client.aclose()
+
+
+def _warn_poll_interval(poll_interval: Optional[float]) -> None:
+    """Warn that wait_for_quiet's poll_interval argument no longer does anything."""
+    if poll_interval is not None:
+        warnings.warn(
+            "wait_for_quiet's poll_interval is deprecated and ignored; "
+            "quiet periods are detected by the server",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+
+
+def _print_json(obj, file=None) -> None:
+    """Print a JSON document followed by a newline in a single write.
+
+    Args:
+        obj: JSON-serializable object
+        file: Stream to write to (default: sys.stdout)
+    """
+    (file or sys.stdout).write(json.dumps(obj) + "\n")
+
+
+def _writev_all(fd: int, buffers: list[bytes]) -> None:
+    """Write every buffer to fd, batching them into writev() calls.
+
+    A non-blocking fd that cannot take more output is waited on until it is
+    writable again, so the rest is still written in order.
+
+    Args:
+        fd: File descriptor to write to
+        buffers: Byte buffers to write, in order
+    """
+    views = [memoryview(buf) for buf in buffers if buf]
+    start = 0
+    while start < len(views):
+        try:
+            written = os.writev(fd, views[start:start + _IOV_MAX])
+        except BlockingIOError:
+            select.select([], [fd], [])
+            continue
+        # Skip fully written buffers, then trim a partially written one
+        while start < len(views) and written >= len(views[start]):
+            written -= len(views[start])
+            start += 1
+        if written:
+            views[start] = views[start][written:]
+
+
+class _TextStream:
+    """Incremental ANSI stripping and UTF-8 decoding of a session's output.
+
+    An escape sequence or multi-byte character split between chunks is held
+    back until the rest of it arrives.
+    """
+
+    def __init__(self):
+        """Initialize with nothing held back."""
+        self._held = b""  # Incomplete trailing escape sequence
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def feed(self, data: bytes, strip_ansi_codes: bool = True) -> str:
+        """Decode the next chunk of output.
+
+        Args:
+            data: Output bytes following the previous chunk
+            strip_ansi_codes: Whether to strip ANSI codes
+
+        Returns:
+            Text of the chunk, up to any incomplete sequence or character
+        """
+        data = self._held + data
+        cut = incomplete_ansi_start(data) if strip_ansi_codes else len(data)
+        self._held = data[cut:]
+        data = data[:cut]
+        return self._decoder.decode(strip_ansi_bytes(data) if strip_ansi_codes else data)
+
+
+class _OutputMirror(ABC):
+    """Client-side copy of a session's buffered output, kept current by
+    fetching only the bytes past its end.
+
+    Requests carry the last ETag, so an unchanged buffer costs an empty 304.
+    Subclasses decide what is kept of the appended bytes.
+    """
+
+    def __init__(self):
+        """Initialize an empty mirror."""
+        self.etag: Optional[str] = None  # ETag of the last applied response
+        self._reset(0)
+
+    def _reset(self, offset: int) -> None:
+        """Drop cached output and restart at a stream offset."""
+        self.start = offset  # Stream offset of the buffer start the mirror covers
+        self.end = offset  # Stream offset just past the mirrored output
+
+    @abstractmethod
+    def _append(self, data: bytes) -> None:
+        """Add newly fetched output bytes."""
+
+    def request(self) -> tuple[dict, dict]:
+        """Build the /output request that fetches only unmirrored output.
+
+        Returns:
+            Tuple of (query params, headers)
+        """
+        params = {"clear": False, "raw": True, "offset": self.end, "base": self.start}
+        return params, {"If-None-Match": self.etag} if self.etag else {}
+
+    def apply(self, response: httpx.Response) -> None:
+        """Apply the response to a request built by request().
+
+        Args:
+            response: Response from the /output endpoint
+        """
+        if response.status_code == 304:
+            return
+        response.raise_for_status()
+        self.update(response.content, int(response.headers["X-Output-Offset"]),
+                    response.headers["ETag"])
+
+    def update(self, data: bytes, offset: int, etag: str) -> None:
+        """Append output read from the given stream offset.
+
+        Args:
+            data: Raw output bytes
+            offset: Stream offset of data
+            etag: ETag of the response; if the buffer no longer starts where
+                the mirror does, it was cleared and the mirror restarts
+        """
+        start, _ = _parse_etag(etag)
+        if start != self.start or offset != self.end:
+            self._reset(offset)
+        self.end = offset + len(data)
+        self.etag = etag
+        self._append(data)
+
+
+class _RawOutput(_OutputMirror):
+    """Raw bytes of a session's buffered output."""
+
+    def _reset(self, offset: int) -> None:
+        super()._reset(offset)
+        self._parts: list[bytes] = []
+
+    def _append(self, data: bytes) -> None:
+        if data:
+            self._parts.append(data)
+
+    @property
+    def data(self) -> bytes:
+        """The buffered output bytes."""
+        if len(self._parts) > 1:
+            self._parts = [b''.join(self._parts)]
+        return self._parts[0] if self._parts else b""
+
+
+class _StrippedText(_OutputMirror):
+    """ANSI-stripped text of a session's output.
+
+    Only bytes appended since the last update are decoded and stripped, so
+    repeated reads cost O(new output) instead of O(whole buffer).
+    """
+
+    def _reset(self, offset: int) -> None:
+        super()._reset(offset)
+        self._stream = _TextStream()
+        self._parts: list[str] = []
+
+    def _append(self, data: bytes) -> None:
+        text = self._stream.feed(data)
+        if text:
+            self._parts.append(text)
+
+    @property
+    def text(self) -> str:
+        """The stripped text so far."""
+        if len(self._parts) > 1:
+            self._parts = [''.join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
 
 class TerminalClient:
     """Client for interacting with terminal wrapper backend."""
@@ -24,8 +354,29 @@ class TerminalClient:
             base_url: Base URL of the backend server
         """
         self.base_url = base_url
-        self.http_client = httpx.Client(base_url=base_url, timeout=10.0)
-        self._read_marks = {}  # Track read positions per session
+        self.http_client = httpx.Client(
+            base_url=base_url,
+            timeout=10.0,
+            transport=httpx.HTTPTransport(limits=_HTTP_LIMITS, http2=_HTTP2, retries=1),
+        )
+        parts = urllib.parse.urlsplit(base_url)
+        self._ws_url_base = urllib.parse.urlunsplit((
+            "wss" if parts.scheme == "https" else "ws",
+            parts.netloc,
+            parts.path.rstrip("/"),
+            "",
+            "",
+        ))
+        self._read_marks = {}  # Output ETag ("start-end" stream offsets) read per session
+        self._line_streams: dict[str, _TextStream] = {}  # get_new_lines() decoding state per session
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._async_http_client_task: Optional[asyncio.Task] = None  # Closes the client with its loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # Runs the sync wait_for_* calls
+        self._loop_thread: Optional[threading.Thread] = None  # Runs self._loop
+        self._loop_lock = threading.Lock()  # Guards starting self._loop
+        self._output_caches: dict[str, _RawOutput] = {}  # Raw buffered output per session
+        self._text_caches: dict[str, _StrippedText] = {}  # Stripped output per session
+        self._screen_caches: dict[str, tuple[str, dict]] = {}  # (ETag, screen) per session
 
     def create_session(
         self, command: list[str], rows: int = 24, cols: int = 80, env: Optional[dict] = None
@@ -81,6 +432,10 @@ class TerminalClient:
         Args:
             session_id: Session ID
         """
+        self._output_caches.pop(session_id, None)
+        self._text_caches.pop(session_id, None)
+        self._screen_caches.pop(session_id, None)
+        self._line_streams.pop(session_id, None)
         response = self.http_client.delete(f"/sessions/{session_id}")
         response.raise_for_status()
 
@@ -91,9 +446,22 @@ class TerminalClient:
             session_id: Session ID
             data: Input data
         """
+        self.write_input_bytes(session_id, data.encode())
+
+    def write_input_bytes(self, session_id: str, data: bytes) -> None:
+        """Write raw input bytes to session.
+
+        The bytes are sent as the request body and written to the terminal
+        unchanged.
+
+        Args:
+            session_id: Session ID
+            data: Input bytes
+        """
         response = self.http_client.post(
-            f"/sessions/{session_id}/input",
-            json={"data": data},
+            f"/sessions/{session_id}/input_raw",
+            content=data,
+            headers={"Content-Type": "application/octet-stream"},
         )
         response.raise_for_status()
 
@@ -107,6 +475,9 @@ class TerminalClient:
         Returns:
             Output data
         """
+        if not clear:
+            return self.get_output_bytes(session_id, clear=False).decode('utf-8', errors='replace')
+
         response = self.http_client.get(
             f"/sessions/{session_id}/output",
             params={"clear": clear},
@@ -114,6 +485,29 @@ class TerminalClient:
         response.raise_for_status()
         return response.json()["output"]
 
+    def get_output_bytes(self, session_id: str, clear: bool = True) -> bytes:
+        """Get session output as raw bytes, without decoding.
+
+        Non-clearing reads are served from a per-session copy of the buffer
+        that only fetches output added since the previous read.
+
+        Args:
+            session_id: Session ID
+            clear: Whether to clear buffer
+
+        Returns:
+            Output bytes
+        """
+        if not clear:
+            return self._refresh(session_id, self._output_caches, _RawOutput).data
+
+        response = self.http_client.get(
+            f"/sessions/{session_id}/output",
+            params={"clear": clear, "raw": True},
+        )
+        response.raise_for_status()
+        return response.content
+
     def get_screen(self, session_id: str) -> dict:
         """Get parsed terminal screen as 2D array.
 
@@ -121,6 +515,9 @@ class TerminalClient:
         ScreenBuffer class, which handles ANSI escape sequences and
         cursor positioning to produce clean, parseable text lines.
 
+        While the screen is unchanged, later calls return the same cached
+        dictionary; copy it before modifying it.
+
         Args:
             session_id: Session ID
 
@@ -131,9 +528,19 @@ class TerminalClient:
                 - cols: Number of columns
                 - cursor: Current cursor position {row, col}
         """
-        response = self.http_client.get(f"/sessions/{session_id}/screen")
+        # Unchanged screens come back as an empty 304, served from the cache
+        cached = self._screen_caches.get(session_id)
+        response = self.http_client.get(
+            f"/sessions/{session_id}/screen",
+            headers={"If-None-Match": cached[0]} if cached else {},
+        )
+        if response.status_code == 304 and cached:
+            return cached[1]
         response.raise_for_status()
-        return response.json()
+        screen = response.json()
+        if "ETag" in response.headers:
+            self._screen_caches[session_id] = (response.headers["ETag"], screen)
+        return screen
 
     def get_text(self, session_id: str, strip_ansi_codes: bool = True,
                  source: str = "output") -> str:
@@ -149,13 +556,91 @@ class TerminalClient:
         """
         if source == "screen":
             screen = self.get_screen(session_id)
-            text = extract_visible_text(screen['lines'])
-        else:
-            text = self.get_output(session_id, clear=False)
-            if strip_ansi_codes:
-                text = strip_ansi(text)
+            return extract_visible_text(screen['lines'])
+
+        if not strip_ansi_codes:
+            return self.get_output_bytes(session_id, clear=False).decode('utf-8', errors='replace')
+
+        return self._refresh(session_id, self._text_caches, _StrippedText).text
+
+    def _refresh(self, session_id: str, caches: dict, mirror_type: type) -> _OutputMirror:
+        """Bring a session's output mirror up to date.
+
+        Args:
+            session_id: Session ID
+            caches: Per-session mirrors of one type
+            mirror_type: _OutputMirror subclass to create if the session has none
+
+        Returns:
+            The updated mirror
+        """
+        mirror = caches.get(session_id)
+        if mirror is None:
+            mirror = caches[session_id] = mirror_type()
+        params, headers = mirror.request()
+        mirror.apply(self.http_client.get(
+            f"/sessions/{session_id}/output", params=params, headers=headers
+        ))
+        return mirror
+
+    def _run_sync(self, coro):
+        """Run one of the async methods to completion from synchronous code.
+
+        All sync calls are submitted to one private event loop running on a
+        helper thread, so the async HTTP client and its pooled connections
+        survive between calls instead of being rebuilt by a fresh
+        asyncio.run() each time. Calls from several threads run concurrently
+        on that loop, and calls from code already running an event loop
+        (async code, Jupyter) block like the plain HTTP methods do.
 
-        return text
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        import asyncio
+
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="term-wrapper-sync-loop", daemon=True
+                )
+                self._loop_thread.start()
+            loop = self._loop
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. KeyboardInterrupt: don't leave the wait running on the loop
+            future.cancel()
+            raise
+
+    def wait_for_bytes(self, session_id: str, needle: bytes, timeout: float = 30,
+                       poll_interval: float = 0.5, strip_ansi_codes: bool = True) -> bool:
+        """Wait for a byte string to appear in output.
+
+        Matching is done on the raw output bytes, so no decoding is needed.
+
+        Args:
+            session_id: Session ID
+            needle: Bytes to wait for
+            timeout: Maximum seconds to wait
+            poll_interval: Maximum seconds between polls (HTTP fallback only)
+            strip_ansi_codes: Whether to strip ANSI codes before checking
+
+        Returns:
+            True if bytes found
+
+        Raises:
+            TimeoutError: If timeout is reached, or once the session ends without the bytes
+        """
+        return self._run_sync(self.wait_for_bytes_async(
+            session_id, needle, timeout=timeout, poll_interval=poll_interval,
+            strip_ansi_codes=strip_ansi_codes,
+        ))
 
     def wait_for_text(self, session_id: str, text: str, timeout: float = 30,
                      poll_interval: float = 0.5, strip_ansi_codes: bool = True) -> bool:
@@ -165,23 +650,19 @@ class TerminalClient:
             session_id: Session ID
             text: Text to wait for
             timeout: Maximum seconds to wait
-            poll_interval: Seconds between polls
+            poll_interval: Maximum seconds between polls (HTTP fallback only)
             strip_ansi_codes: Whether to strip ANSI codes before checking
 
         Returns:
             True if text found, False if timeout
 
         Raises:
-            TimeoutError: If timeout is reached
+            TimeoutError: If timeout is reached, or once the session ends without the text
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            current_text = self.get_text(session_id, strip_ansi_codes=strip_ansi_codes)
-            if text in current_text:
-                return True
-            time.sleep(poll_interval)
-
-        raise TimeoutError(f"Text '{text}' not found within {timeout} seconds")
+        return self._run_sync(self.wait_for_text_async(
+            session_id, text, timeout=timeout, poll_interval=poll_interval,
+            strip_ansi_codes=strip_ansi_codes,
+        ))
 
     def wait_for_condition(self, session_id: str, condition: Callable[[str], bool],
                           timeout: float = 30, poll_interval: float = 0.5) -> bool:
@@ -191,31 +672,30 @@ class TerminalClient:
             session_id: Session ID
             condition: Function that takes current text and returns bool
             timeout: Maximum seconds to wait
-            poll_interval: Seconds between polls
+            poll_interval: Maximum seconds between polls (HTTP fallback only)
 
         Returns:
             True if condition met, False if timeout
 
         Raises:
-            TimeoutError: If timeout is reached
+            TimeoutError: If timeout is reached, or once the session ends without meeting it
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            current_text = self.get_text(session_id)
-            if condition(current_text):
-                return True
-            time.sleep(poll_interval)
-
-        raise TimeoutError(f"Condition not met within {timeout} seconds")
+        return self._run_sync(self.wait_for_condition_async(
+            session_id, condition, timeout=timeout, poll_interval=poll_interval,
+        ))
 
     def wait_for_quiet(self, session_id: str, duration: float = 2.0,
-                      poll_interval: float = 0.5, timeout: float = 30) -> bool:
+                      poll_interval: Optional[float] = None, timeout: float = 30) -> bool:
         """Wait for output to stop changing.
 
+        The server tracks when output last arrived, so this is a single
+        request that returns once the session has been quiet long enough.
+
         Args:
             session_id: Session ID
             duration: Seconds of no change required
-            poll_interval: Seconds between polls
+            poll_interval: Deprecated and ignored (passing it warns); kept so
+                positional timeout arguments still work
             timeout: Maximum seconds to wait
 
         Returns:
@@ -224,50 +704,337 @@ class TerminalClient:
         Raises:
             TimeoutError: If timeout is reached
         """
-        start_time = time.time()
-        last_text = None
-        quiet_start = None
+        _warn_poll_interval(poll_interval)
+        response = self.http_client.get(
+            f"/sessions/{session_id}/quiet",
+            params={"duration": duration, "timeout": timeout},
+            timeout=timeout + 10.0,
+        )
+        return _quiet_result(response, timeout)
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """Async HTTP client used by the *_async methods, created on first use.
+
+        The client is bound to the event loop it was created on; using it
+        from another loop replaces it with a new one. Each client is closed
+        on its own loop, by aclose() or else when the loop shuts down, so a
+        replaced client does not leak its connections.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        task = self._async_http_client_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=10.0,
+                transport=httpx.AsyncHTTPTransport(limits=_HTTP_LIMITS, http2=_HTTP2, retries=1),
+            )
+            self._async_http_client = client
+            self._async_http_client_task = loop.create_task(
+                _close_on_cancel(client), name="term-wrapper-async-http-client"
+            )
+        return self._async_http_client
 
-        while time.time() - start_time < timeout:
-            current_text = self.get_text(session_id)
+    async def get_output_bytes_async(self, session_id: str, clear: bool = True) -> bytes:
+        """Async version of get_output_bytes().
 
-            if current_text == last_text:
-                if quiet_start is None:
-                    quiet_start = time.time()
-                elif time.time() - quiet_start >= duration:
+        Args:
+            session_id: Session ID
+            clear: Whether to clear buffer
+
+        Returns:
+            Output bytes
+        """
+        if not clear:
+            mirror = await self._refresh_async(session_id, self._output_caches, _RawOutput)
+            return mirror.data
+
+        response = await self.async_http_client.get(
+            f"/sessions/{session_id}/output",
+            params={"clear": clear, "raw": True},
+        )
+        response.raise_for_status()
+        return response.content
+
+    async def get_text_async(self, session_id: str, strip_ansi_codes: bool = True) -> str:
+        """Async version of get_text() for the raw output source.
+
+        Args:
+            session_id: Session ID
+            strip_ansi_codes: Whether to remove ANSI escape codes
+
+        Returns:
+            Clean text output
+        """
+        if not strip_ansi_codes:
+            data = await self.get_output_bytes_async(session_id, clear=False)
+            return data.decode('utf-8', errors='replace')
+
+        mirror = await self._refresh_async(session_id, self._text_caches, _StrippedText)
+        return mirror.text
+
+    async def _refresh_async(self, session_id: str, caches: dict,
+                             mirror_type: type) -> _OutputMirror:
+        """Async version of _refresh()."""
+        mirror = caches.get(session_id)
+        if mirror is None:
+            mirror = caches[session_id] = mirror_type()
+        params, headers = mirror.request()
+        mirror.apply(await self.async_http_client.get(
+            f"/sessions/{session_id}/output", params=params, headers=headers
+        ))
+        return mirror
+
+    async def _await_output(self, session_id: str, predicate: Callable[[bytearray, int], bool],
+                            timeout: float, strip_ansi_codes: bool = True) -> Optional[bool]:
+        """Watch pushed session output until a predicate holds.
+
+        Output arrives over the non-consuming /stream WebSocket, which starts
+        with the currently buffered output. Only newly received bytes are
+        ANSI-stripped; an escape sequence split across frames is held back
+        until it is complete.
+
+        Args:
+            session_id: Session ID
+            predicate: Called as predicate(output, start) after output grows,
+                where start is the offset of the newly added bytes
+            timeout: Maximum seconds to wait
+            strip_ansi_codes: Whether to strip ANSI codes from the output
+
+        Returns:
+            True if the predicate held, False if the output stream ended
+            first, None if the stream is unavailable or dropped this client
+            for falling behind
+
+        Raises:
+            TimeoutError: If timeout is reached
+        """
+        import asyncio
+        import websockets
+
+        url = f"{self._ws_url_base}/sessions/{session_id}/stream"
+
+        async with asyncio.timeout(timeout):
+            try:
+                websocket = await websockets.connect(url, max_size=None)
+            except (OSError, websockets.exceptions.InvalidHandshake):
+                return None
+
+            async with websocket:
+                output = bytearray()
+                held = b""  # Incomplete trailing escape sequence
+                if predicate(output, 0):
                     return True
+
+                while True:
+                    try:
+                        message = await websocket.recv()
+                    except websockets.exceptions.ConnectionClosed:
+                        if websocket.close_code == _STREAM_OVERFLOW_CODE:
+                            return None
+                        return False
+
+                    if not isinstance(message, bytes):
+                        continue
+                    start = len(output)
+                    if strip_ansi_codes:
+                        data = held + message
+                        cut = incomplete_ansi_start(data)
+                        held = data[cut:]
+                        output += strip_ansi_bytes(data[:cut])
+                    else:
+                        output += message
+                    if len(output) > start and predicate(output, start):
+                        return True
+
+    async def wait_for_bytes_async(self, session_id: str, needle: bytes, timeout: float = 30,
+                                   poll_interval: float = 0.5,
+                                   strip_ansi_codes: bool = True) -> bool:
+        """Async version of wait_for_bytes().
+
+        Output is pushed by the server, so the wait ends as soon as the
+        needle arrives, or as soon as the session ends without it. Falls
+        back to HTTP polling if the stream endpoint is unavailable.
+
+        Raises:
+            TimeoutError: If timeout is reached or the session ended first
+        """
+        return await self._wait_for_needle(session_id, needle, f"Bytes {needle!r}", timeout,
+                                           poll_interval, strip_ansi_codes)
+
+    async def wait_for_text_async(self, session_id: str, text: str, timeout: float = 30,
+                                  poll_interval: float = 0.5,
+                                  strip_ansi_codes: bool = True) -> bool:
+        """Async version of wait_for_text().
+
+        Raises:
+            TimeoutError: If timeout is reached or the session ended first
+        """
+        return await self._wait_for_needle(session_id, text.encode(), f"Text '{text}'", timeout,
+                                           poll_interval, strip_ansi_codes)
+
+    async def _wait_for_needle(self, session_id: str, needle: bytes, label: str, timeout: float,
+                               poll_interval: float, strip_ansi_codes: bool) -> bool:
+        """Shared implementation of wait_for_bytes_async() and wait_for_text_async().
+
+        Args:
+            label: What is waited for, as named in the error message
+
+        Raises:
+            TimeoutError: If timeout is reached or the session ended first
+        """
+        deadline = time.monotonic() + timeout
+
+        def found(output: bytearray, start: int) -> bool:
+            # Only rescan the new bytes plus enough overlap for a split needle
+            return output.find(needle, max(0, start - len(needle) + 1)) != -1
+
+        ended = False
+        try:
+            result = await self._await_output(session_id, found, timeout, strip_ansi_codes)
+            if result is None:
+                result = await self._poll_for_bytes(session_id, needle, deadline,
+                                                    poll_interval, strip_ansi_codes)
             else:
-                quiet_start = None
-                last_text = current_text
+                ended = not result
+        except TimeoutError:
+            result = False
+        if ended:
+            raise TimeoutError(f"{label} not found before the session ended")
+        if not result:
+            raise TimeoutError(f"{label} not found within {timeout} seconds")
+        return True
+
+    async def wait_for_condition_async(self, session_id: str, condition: Callable[[str], bool],
+                                       timeout: float = 30, poll_interval: float = 0.5) -> bool:
+        """Async version of wait_for_condition().
 
-            time.sleep(poll_interval)
+        Raises:
+            TimeoutError: If timeout is reached or the session ended first
+        """
+        deadline = time.monotonic() + timeout
+        # Only newly pushed bytes are decoded (they arrive already stripped)
+        stream = _TextStream()
+        text = ""
 
-        raise TimeoutError(f"Output did not stabilize within {timeout} seconds")
+        def met(output: bytearray, start: int) -> bool:
+            nonlocal text
+            text += stream.feed(bytes(output[start:]), strip_ansi_codes=False)
+            return condition(text)
 
-    def get_new_lines(self, session_id: str, strip_ansi_codes: bool = True) -> list[str]:
-        """Get new lines since last call to this method.
+        ended = False
+        try:
+            result = await self._await_output(session_id, met, timeout)
+            if result is None:
+                result = await self._poll_for_condition(session_id, condition, deadline, poll_interval)
+            else:
+                ended = not result
+        except TimeoutError:
+            result = False
+        if ended:
+            raise TimeoutError("Condition not met before the session ended")
+        if not result:
+            raise TimeoutError(f"Condition not met within {timeout} seconds")
+        return True
+
+    async def wait_for_quiet_async(self, session_id: str, duration: float = 2.0,
+                                   poll_interval: Optional[float] = None, timeout: float = 30) -> bool:
+        """Async version of wait_for_quiet().
+
+        Raises:
+            TimeoutError: If timeout is reached
+        """
+        _warn_poll_interval(poll_interval)
+        response = await self.async_http_client.get(
+            f"/sessions/{session_id}/quiet",
+            params={"duration": duration, "timeout": timeout},
+            timeout=timeout + 10.0,
+        )
+        return _quiet_result(response, timeout)
+
+    async def _poll_for_bytes(self, session_id: str, needle: bytes, deadline: float,
+                              poll_interval: float, strip_ansi_codes: bool) -> bool:
+        """HTTP polling fallback for wait_for_bytes_async()."""
+        interval = MIN_POLL_INTERVAL
+        last_data = None
+        while time.monotonic() < deadline:
+            data = await self.get_output_bytes_async(session_id, clear=False)
+            if _contains_needle(needle, data, strip_ansi_codes):
+                return True
+            interval = await _backoff_sleep(interval, data != last_data, poll_interval, deadline)
+            last_data = data
+        return False
+
+    async def _poll_for_condition(self, session_id: str, condition: Callable[[str], bool],
+                                  deadline: float, poll_interval: float) -> bool:
+        """HTTP polling fallback for wait_for_condition_async()."""
+        interval = MIN_POLL_INTERVAL
+        last_text = None
+        while time.monotonic() < deadline:
+            current_text = await self.get_text_async(session_id)
+            if condition(current_text):
+                return True
+            interval = await _backoff_sleep(interval, current_text != last_text,
+                                            poll_interval, deadline)
+            last_text = current_text
+        return False
+
+    def _fetch_unread(self, session_id: str) -> Optional[bytes]:
+        """Fetch output added since the session's read mark.
+
+        The read mark is the ETag returned by the server, which ends with the
+        stream offset past the output read so far. Only new bytes are
+        transferred, and polls with no new output get an empty 304 response.
 
         Args:
             session_id: Session ID
-            strip_ansi_codes: Whether to strip ANSI codes
 
         Returns:
-            List of new lines since last call
+            Unread output bytes, or None if nothing changed
         """
-        current_text = self.get_text(session_id, strip_ansi_codes=strip_ansi_codes)
-        current_lines = current_text.split('\n')
+        etag = self._read_marks.get(session_id)
+        offset = _parse_etag(etag)[1] if etag else 0
+        response = self.http_client.get(
+            f"/sessions/{session_id}/output",
+            params={"clear": False, "raw": True, "offset": offset},
+            headers={"If-None-Match": etag} if etag else {},
+        )
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
 
-        if session_id not in self._read_marks:
-            # First call - return all lines
-            self._read_marks[session_id] = len(current_lines)
-            return current_lines
+        # The server only sends output past the mark (or the whole buffer
+        # if the mark's output was cleared since, which breaks the stream
+        # any held-back partial sequence belonged to)
+        self._read_marks[session_id] = response.headers["ETag"]
+        if int(response.headers["X-Output-Offset"]) != offset:
+            self._line_streams.pop(session_id, None)
+        return response.content
+
+    def _line_stream(self, session_id: str) -> _TextStream:
+        """Get the decoding state used by get_new_lines() for a session."""
+        stream = self._line_streams.get(session_id)
+        if stream is None:
+            stream = self._line_streams[session_id] = _TextStream()
+        return stream
 
-        # Return only new lines
-        last_count = self._read_marks[session_id]
-        new_lines = current_lines[last_count:]
-        self._read_marks[session_id] = len(current_lines)
+    def get_new_lines(self, session_id: str, strip_ansi_codes: bool = True) -> list[str]:
+        """Get new lines since last call to this method.
 
-        return new_lines
+        Args:
+            session_id: Session ID
+            strip_ansi_codes: Whether to strip ANSI codes
+
+        Returns:
+            List of new lines since last call; an escape sequence or
+            character cut off at the end is held back for the next call
+        """
+        data = self._fetch_unread(session_id)
+        if data is None:
+            return []
+        return self._line_stream(session_id).feed(data, strip_ansi_codes).split('\n')
 
     def mark_read(self, session_id: str) -> None:
         """Mark current output as read.
@@ -277,9 +1044,10 @@ class TerminalClient:
         Args:
             session_id: Session ID
         """
-        current_text = self.get_text(session_id)
-        current_lines = current_text.split('\n')
-        self._read_marks[session_id] = len(current_lines)
+        data = self._fetch_unread(session_id)
+        if data is not None:
+            # Keep a cut-off sequence so the next read can complete it
+            self._line_stream(session_id).feed(data)
 
     async def interactive_session(self, session_id: str) -> None:
         """Run an interactive session via WebSocket.
@@ -287,58 +1055,128 @@ class TerminalClient:
         Args:
             session_id: Session ID
         """
-        ws_url = self.base_url.replace("http://", "ws://").replace("https://", "wss://")
-        ws_url = f"{ws_url}/sessions/{session_id}/ws"
+        # Only attach needs these; plain commands skip importing them
+        import asyncio
+        import termios
+        import tty
+        import websockets
+
+        ws_url = f"{self._ws_url_base}/sessions/{session_id}/ws"
+
+        # Output bypasses sys.stdout below, so emit anything already buffered first
+        sys.stdout.flush()
 
         # Save terminal settings
         old_settings = termios.tcgetattr(sys.stdin)
+        stdin_fd = sys.stdin.fileno()
+        loop = asyncio.get_running_loop()
 
         try:
             # Set terminal to raw mode
             tty.setraw(sys.stdin)
 
-            async with websockets.connect(ws_url) as websocket:
+            # Read stdin on the event loop itself instead of a worker thread.
+            # stdin stays blocking: on a tty it shares its file description
+            # with stdout, which must not become non-blocking, and a single
+            # read after a readiness event does not block.
+            input_queue: asyncio.Queue[bytes] = asyncio.Queue()
+
+            def on_stdin_ready():
+                # Read whatever is available (a whole paste at once)
+                data = os.read(stdin_fd, STDIN_READ_SIZE)
+                if not data:
+                    loop.remove_reader(stdin_fd)  # stdin closed
+                input_queue.put_nowait(data)
+
+            loop.add_reader(stdin_fd, on_stdin_ready)
+
+            # Output-heavy TUIs send large, highly compressible ANSI frames
+            async with websockets.connect(
+                ws_url,
+                compression="deflate",
+                max_size=8 * 1024 * 1024,
+                write_limit=1024 * 1024,
+                ping_interval=20,
+                ping_timeout=20,
+            ) as websocket:
 
                 async def send_input():
-                    """Read from stdin and send to WebSocket."""
-                    loop = asyncio.get_event_loop()
+                    """Send stdin chunks to the WebSocket."""
                     while True:
-                        try:
-                            # Read one byte at a time
-                            char = await loop.run_in_executor(
-                                None, sys.stdin.buffer.read, 1
-                            )
-                            if char:
-                                await websocket.send(char)
-                        except Exception:
-                            break
+                        data = await input_queue.get()
+                        if not data:
+                            break  # stdin closed
+                        await websocket.send(data)
 
                 async def receive_output():
                     """Receive from WebSocket and write to stdout."""
-                    while True:
-                        try:
-                            message = await websocket.recv()
-                            if isinstance(message, bytes):
-                                sys.stdout.buffer.write(message)
-                                sys.stdout.buffer.flush()
-                            elif message == "__TERMINAL_CLOSED__":
+                    stdout_fd = sys.stdout.fileno()
+                    pending: list[bytes] = []
+
+                    def flush_pending():
+                        # Frames received in the same loop iteration go out in one writev
+                        _writev_all(stdout_fd, pending)
+                        pending.clear()
+
+                    try:
+                        while True:
+                            try:
+                                message = await websocket.recv()
+                            except websockets.exceptions.ConnectionClosed:
                                 break
-                        except websockets.exceptions.ConnectionClosed:
-                            break
-                        except Exception:
-                            break
-
-                # Run both tasks concurrently
-                await asyncio.gather(send_input(), receive_output())
+                            if isinstance(message, str):
+                                # The server closes with a close code on exit; older
+                                # servers sent a text sentinel instead
+                                break
+                            if not pending:
+                                loop.call_soon(flush_pending)
+                            pending.append(message)
+                    finally:
+                        flush_pending()
+
+                # Run both tasks concurrently; an error in either cancels the other.
+                # Once output ends the session is over, so stop waiting for input.
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        send_task = tg.create_task(send_input())
+                        await receive_output()
+                        send_task.cancel()
+                except* websockets.exceptions.ConnectionClosed:
+                    pass  # Server went away while sending; the session is over
 
         finally:
+            loop.remove_reader(stdin_fd)
             # Restore terminal settings
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
 
     def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP clients and the event loop used by sync waits."""
+        if self._loop is not None:
+            task = self._async_http_client_task
+            if task is not None and task.get_loop() is self._loop:
+                self._run_sync(self.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
+            self._loop_thread = None
         self.http_client.close()
 
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was created on the running loop.
+
+        A client created on another loop is closed when that loop shuts down.
+        """
+        import asyncio
+
+        task = self._async_http_client_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        self._async_http_client = None
+        self._async_http_client_task = None
+        task.cancel()
+        await asyncio.wait([task])
+
 
 def sync_main():
     """Main CLI entry point (synchronous commands)."""
@@ -418,7 +1256,7 @@ Examples:
     wait_text_parser.add_argument("session_id", help="Session ID")
     wait_text_parser.add_argument("text", help="Text to wait for")
     wait_text_parser.add_argument("--timeout", type=float, default=30, help="Timeout in seconds")
-    wait_text_parser.add_argument("--poll-interval", type=float, default=0.5, help="Poll interval in seconds")
+    wait_text_parser.add_argument("--poll-interval", type=float, default=0.5, help="Maximum poll interval in seconds")
 
     # Wait for quiet
     wait_quiet_parser = subparsers.add_parser("wait-quiet", help="Wait for output to stabilize")
@@ -452,33 +1290,25 @@ Examples:
     if args.command == "stop":
         server_manager = ServerManager()
         result = server_manager.stop_server()
-        print(json.dumps(result))
+        _print_json(result)
         sys.exit(0 if result["status"] in ["stopped", "not_running"] else 1)
 
     # Auto-discover or start server if URL not provided
     if args.url is None:
-        # For web command, allow custom host/port
-        if args.command == "web" and hasattr(args, 'host'):
-            server_manager = ServerManager()
-            try:
+        server_manager = ServerManager()
+        try:
+            # For web command, allow custom host/port
+            if args.command == "web" and hasattr(args, 'host'):
                 url = server_manager.get_server_url(host=args.host, port=args.port)
-            except Exception as e:
-                print(json.dumps({
-                    "error": "Failed to start server",
-                    "details": str(e)
-                }), file=sys.stderr)
-                sys.exit(1)
-        else:
-            # Use default auto-discovery
-            server_manager = ServerManager()
-            try:
+            else:
+                # Use default auto-discovery
                 url = server_manager.get_server_url()
-            except Exception as e:
-                print(json.dumps({
-                    "error": "Failed to start server",
-                    "details": str(e)
-                }), file=sys.stderr)
-                sys.exit(1)
+        except Exception as e:
+            _print_json({
+                "error": "Failed to start server",
+                "details": str(e)
+            }, file=sys.stderr)
+            sys.exit(1)
     else:
         url = args.url
 
@@ -493,31 +1323,30 @@ Examples:
                 cols=args.cols,
                 env=env
             )
-            print(json.dumps({"session_id": session_id}))
+            _print_json({"session_id": session_id})
 
         elif args.command == "list":
             sessions = client.list_sessions()
-            print(json.dumps({"sessions": sessions}))
+            _print_json({"sessions": sessions})
 
         elif args.command == "info":
             info = client.get_session_info(args.session_id)
-            print(json.dumps(info))
+            _print_json(info)
 
         elif args.command == "delete":
             client.delete_session(args.session_id)
-            print(json.dumps({"status": "deleted"}))
+            _print_json({"status": "deleted"})
 
         elif args.command == "send":
             # Process escape sequences (\n, \r, \t, \x1b, etc.)
-            import codecs
             try:
                 # Decode escape sequences (handles \n, \r, \t, \xNN, etc.)
                 text = codecs.decode(args.text, 'unicode_escape')
             except Exception:
                 # If decoding fails, use text as-is
                 text = args.text
-            client.write_input(args.session_id, text)
-            print(json.dumps({"status": "sent"}))
+            client.write_input_bytes(args.session_id, text.encode('utf-8', 'surrogateescape'))
+            _print_json({"status": "sent"})
 
         elif args.command == "get-output":
             output = client.get_output(args.session_id, clear=not args.no_clear)
@@ -533,7 +1362,7 @@ Examples:
 
         elif args.command == "get-screen":
             screen = client.get_screen(args.session_id)
-            print(json.dumps(screen))
+            _print_json(screen)
 
         elif args.command == "wait-text":
             found = client.wait_for_text(
@@ -542,7 +1371,7 @@ Examples:
                 timeout=args.timeout,
                 poll_interval=args.poll_interval
             )
-            print(json.dumps({"found": found}))
+            _print_json({"found": found})
 
         elif args.command == "wait-quiet":
             stable = client.wait_for_quiet(
@@ -550,18 +1379,22 @@ Examples:
                 duration=args.duration,
                 timeout=args.timeout
             )
-            print(json.dumps({"stable": stable}))
+            _print_json({"stable": stable})
 
         elif args.command == "attach":
-            # This needs async
-            asyncio.run(attach_interactive(client, args.session_id))
+            import asyncio
+
+            # This needs async; use uvloop's faster reactor when installed
+            try:
+                import uvloop
+                loop_factory = uvloop.new_event_loop
+            except ImportError:
+                loop_factory = None
+            asyncio.run(attach_interactive(client, args.session_id), loop_factory=loop_factory)
 
         elif args.command == "web":
             # Check if session_or_command is a session ID (UUID format)
-            import re
-            uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-
-            if re.match(uuid_pattern, args.session_or_command):
+            if _UUID_RE.match(args.session_or_command):
                 # It's a session ID - open existing session
                 session_id = args.session_or_command
             else:
@@ -572,24 +1405,29 @@ Examples:
                     rows=args.rows,
                     cols=args.cols
                 )
-                print(json.dumps({"session_id": session_id, "command": command}))
+                _print_json({"session_id": session_id, "command": command})
 
             # Open session in browser
             web_url = f"{url}/?session={session_id}"
-            print(json.dumps({"url": web_url, "session_id": session_id}))
+            _print_json({"url": web_url, "session_id": session_id})
             webbrowser.open(web_url)
 
     except TimeoutError as e:
-        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        _print_json({"error": str(e)}, file=sys.stderr)
         sys.exit(1)
     except httpx.ConnectError as e:
-        print(json.dumps({
+        _print_json({
             "error": f"Cannot connect to term-wrapper server at {client.base_url}",
             "details": str(e)
-        }), file=sys.stderr)
+        }, file=sys.stderr)
+        sys.exit(1)
+    except ExceptionGroup as e:
+        # Report what failed inside attach's task group, not the group itself
+        errors = [str(exc) for exc in _leaf_exceptions(e)]
+        _print_json({"error": "; ".join(errors)}, file=sys.stderr)
         sys.exit(1)
     except Exception as e:
-        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        _print_json({"error": str(e)}, file=sys.stderr)
         sys.exit(1)
     finally:
         client.close()
@@ -9,6 +9,34 @@ of what would appear on a real terminal screen.
 import re
 from typing import List, Tuple, Optional
 
+# Escape sequences recognised in terminal output. Only CSI sequences
+# (ESC [ params final) are acted on; the rest are skipped:
+# ESC ( X (character set), ESC ? ... h/l/H (DEC private mode), and any other
+# two-character escape such as ESC = / ESC >. A lone ESC at the very end of
+# the output is left to be written as text.
+_ESC_RE = re.compile(r'\x1b(?:\[([0-9;?]*)([^0-9;?])|\(.?|\?[^hlH]*[hlH]?|.)', re.DOTALL)
+
+# Characters write_char handles as cursor movement rather than writing a cell
+_CONTROL_RE = re.compile(r'([\n\r\t\b])')
+
+
+def _csi_param(params: str, index: int, default: int) -> int:
+    """
+    Get one numeric parameter of a CSI sequence.
+
+    Args:
+        params: Parameter string, e.g. '1;2' or '?25'
+        index: Position of the parameter among the ';'-separated fields
+        default: Value used when the field is missing, empty or not a number
+
+    Returns:
+        The parameter value
+    """
+    parts = params.split(';')
+    if index < len(parts) and parts[index].isdecimal():
+        return int(parts[index])
+    return default
+
 
 class ScreenBuffer:
     """
@@ -31,11 +59,19 @@ class ScreenBuffer:
         self.cols = cols
         self.cursor_row = 0
         self.cursor_col = 0
-        self.screen: List[List[str]] = [[' ' for _ in range(cols)] for _ in range(rows)]
+        # Row-major grid of one-character cells; cell (row, col) is at row * cols + col
+        self.screen: List[str] = [' '] * (rows * cols)
+        # Blank grid and row that clears copy from, so they fill the screen in place
+        self._blank_screen: Tuple[str, ...] = (' ',) * (rows * cols)
+        self._blank_row: Tuple[str, ...] = (' ',) * cols
+        # Rendered rows from get_screen_lines, and the rows changed since
+        self._line_cache: List[str] = [''] * rows
+        self._dirty: set[int] = set(range(rows))
 
     def clear(self):
         """Clear the entire screen."""
-        self.screen = [[' ' for _ in range(self.cols)] for _ in range(self.rows)]
+        self.screen[:] = self._blank_screen
+        self._dirty.update(range(self.rows))
         self.cursor_row = 0
         self.cursor_col = 0
 
@@ -44,23 +80,28 @@ class ScreenBuffer:
         if row is None:
             row = self.cursor_row
         if 0 <= row < self.rows:
-            for col in range(self.cursor_col, self.cols):
-                self.screen[row][col] = ' '
+            base = row * self.cols
+            self.screen[base + self.cursor_col:base + self.cols] = self._blank_row[self.cursor_col:]
+            self._dirty.add(row)
 
     def clear_line_from_start(self, row: Optional[int] = None):
         """Clear a line from start to cursor."""
         if row is None:
             row = self.cursor_row
         if 0 <= row < self.rows:
-            for col in range(0, min(self.cursor_col + 1, self.cols)):
-                self.screen[row][col] = ' '
+            base = row * self.cols
+            count = min(self.cursor_col + 1, self.cols)
+            self.screen[base:base + count] = self._blank_row[:count]
+            self._dirty.add(row)
 
     def clear_entire_line(self, row: Optional[int] = None):
         """Clear entire line."""
         if row is None:
             row = self.cursor_row
         if 0 <= row < self.rows:
-            self.screen[row] = [' ' for _ in range(self.cols)]
+            base = row * self.cols
+            self.screen[base:base + self.cols] = self._blank_row
+            self._dirty.add(row)
 
     def write_char(self, char: str):
         """
@@ -82,10 +123,12 @@ class ScreenBuffer:
             if self.cursor_col > 0:
                 self.cursor_col -= 1
         else:
-            # Regular character
-            if 0 <= self.cursor_row < self.rows and 0 <= self.cursor_col < self.cols:
-                self.screen[self.cursor_row][self.cursor_col] = char
-            self.cursor_col += 1
+            # Regular character (the cursor is never negative, so only the upper bounds need checking)
+            row, col = self.cursor_row, self.cursor_col
+            if col < self.cols and row < self.rows:
+                self.screen[row * self.cols + col] = char
+                self._dirty.add(row)
+            self.cursor_col = col + 1
 
         # Handle cursor overflow
         if self.cursor_col >= self.cols:
@@ -119,6 +162,97 @@ class ScreenBuffer:
         new_col = self.cursor_col + col_delta
         self.move_cursor(new_row, new_col)
 
+    # CSI handlers, keyed by the sequence's final character. Each takes the
+    # parameter string (everything between ESC [ and the final character) and
+    # returns True if it handled the sequence. They never raise: output is
+    # rendered in large batches, so one odd sequence (extra modifier
+    # parameters, a private-mode '?') must not abort the rest of the batch.
+
+    def _csi_cursor_position(self, params: str) -> bool:
+        """Cursor position: ESC [ row ; col H or ESC [ row ; col f."""
+        self.move_cursor(_csi_param(params, 0, 1) - 1, _csi_param(params, 1, 1) - 1)
+        return True
+
+    def _csi_cursor_up(self, params: str) -> bool:
+        """Cursor up: ESC [ n A (further parameters, such as key modifiers, are ignored)."""
+        self.move_cursor_relative(-_csi_param(params, 0, 1), 0)
+        return True
+
+    def _csi_cursor_down(self, params: str) -> bool:
+        """Cursor down: ESC [ n B."""
+        self.move_cursor_relative(_csi_param(params, 0, 1), 0)
+        return True
+
+    def _csi_cursor_forward(self, params: str) -> bool:
+        """Cursor forward: ESC [ n C."""
+        self.move_cursor_relative(0, _csi_param(params, 0, 1))
+        return True
+
+    def _csi_cursor_backward(self, params: str) -> bool:
+        """Cursor backward: ESC [ n D."""
+        self.move_cursor_relative(0, -_csi_param(params, 0, 1))
+        return True
+
+    def _csi_erase_display(self, params: str) -> bool:
+        """Clear screen (ESC [ 2 J) or from cursor to end of screen (ESC [ J, ESC [ 0 J)."""
+        if params == '2':
+            self.clear()
+            return True
+        if params == '' or params == '0':
+            # Clear from cursor to end of current line
+            self.clear_line()
+            # Clear all lines below
+            start = (self.cursor_row + 1) * self.cols
+            self.screen[start:] = self._blank_screen[start:]
+            self._dirty.update(range(self.cursor_row + 1, self.rows))
+            return True
+        return False
+
+    def _csi_erase_line(self, params: str) -> bool:
+        """Clear to end (ESC [ K, ESC [ 0 K), to cursor (ESC [ 1 K) or whole line (ESC [ 2 K)."""
+        if params == '' or params == '0':
+            self.clear_line()
+        elif params == '1':
+            self.clear_line_from_start()
+        elif params == '2':
+            self.clear_entire_line()
+        else:
+            return False
+        return True
+
+    def _csi_save_cursor(self, params: str) -> bool:
+        """Save cursor position: ESC [ s."""
+        if params:
+            return False
+        self.saved_cursor = (self.cursor_row, self.cursor_col)
+        return True
+
+    def _csi_restore_cursor(self, params: str) -> bool:
+        """Restore cursor position: ESC [ u."""
+        if params:
+            return False
+        if hasattr(self, 'saved_cursor'):
+            self.cursor_row, self.cursor_col = self.saved_cursor
+        return True
+
+    def _csi_select_graphic_rendition(self, params: str) -> bool:
+        """Color/style (SGR): ESC [ ... m. Ignored, since only characters are kept."""
+        return True
+
+    _CSI_HANDLERS = {
+        'H': _csi_cursor_position,
+        'f': _csi_cursor_position,
+        'A': _csi_cursor_up,
+        'B': _csi_cursor_down,
+        'C': _csi_cursor_forward,
+        'D': _csi_cursor_backward,
+        'J': _csi_erase_display,
+        'K': _csi_erase_line,
+        's': _csi_save_cursor,
+        'u': _csi_restore_cursor,
+        'm': _csi_select_graphic_rendition,
+    }
+
     def process_ansi_escape(self, sequence: str) -> bool:
         """
         Process a single ANSI escape sequence.
@@ -130,87 +264,57 @@ class ScreenBuffer:
             True if sequence was handled, False otherwise
         """
         # CSI sequences: ESC [ ... letter
-        if sequence.startswith('['):
-            csi_body = sequence[1:]
-
-            # Cursor position: ESC [ row ; col H or ESC [ row ; col f
-            if csi_body.endswith('H') or csi_body.endswith('f'):
-                parts = csi_body[:-1].split(';')
-                row = int(parts[0]) - 1 if len(parts) > 0 and parts[0] else 0
-                col = int(parts[1]) - 1 if len(parts) > 1 and parts[1] else 0
-                self.move_cursor(row, col)
-                return True
-
-            # Cursor up: ESC [ n A
-            if csi_body.endswith('A'):
-                n = int(csi_body[:-1]) if csi_body[:-1] else 1
-                self.move_cursor_relative(-n, 0)
-                return True
-
-            # Cursor down: ESC [ n B
-            if csi_body.endswith('B'):
-                n = int(csi_body[:-1]) if csi_body[:-1] else 1
-                self.move_cursor_relative(n, 0)
-                return True
-
-            # Cursor forward: ESC [ n C
-            if csi_body.endswith('C'):
-                n = int(csi_body[:-1]) if csi_body[:-1] else 1
-                self.move_cursor_relative(0, n)
-                return True
-
-            # Cursor backward: ESC [ n D
-            if csi_body.endswith('D'):
-                n = int(csi_body[:-1]) if csi_body[:-1] else 1
-                self.move_cursor_relative(0, -n)
-                return True
-
-            # Clear screen: ESC [ 2 J
-            if csi_body == '2J':
-                self.clear()
-                return True
-
-            # Clear from cursor to end of screen: ESC [ 0 J or ESC [ J
-            if csi_body == 'J' or csi_body == '0J':
-                # Clear from cursor to end of current line
-                self.clear_line()
-                # Clear all lines below
-                for row in range(self.cursor_row + 1, self.rows):
-                    self.screen[row] = [' ' for _ in range(self.cols)]
-                return True
-
-            # Clear from cursor to end of line: ESC [ K or ESC [ 0 K
-            if csi_body == 'K' or csi_body == '0K':
-                self.clear_line()
-                return True
-
-            # Clear from beginning of line to cursor: ESC [ 1 K
-            if csi_body == '1K':
-                self.clear_line_from_start()
-                return True
-
-            # Clear entire line: ESC [ 2 K
-            if csi_body == '2K':
-                self.clear_entire_line()
-                return True
-
-            # Save cursor position: ESC [ s
-            if csi_body == 's':
-                self.saved_cursor = (self.cursor_row, self.cursor_col)
-                return True
-
-            # Restore cursor position: ESC [ u
-            if csi_body == 'u':
-                if hasattr(self, 'saved_cursor'):
-                    self.cursor_row, self.cursor_col = self.saved_cursor
-                return True
-
-            # Ignore color/style sequences (SGR): ESC [ ... m
-            if csi_body.endswith('m'):
-                return True
-
+        if sequence.startswith('[') and len(sequence) > 1:
+            handler = self._CSI_HANDLERS.get(sequence[-1])
+            if handler is not None:
+                return handler(self, sequence[1:-1])
         return False
 
+    def _write_run(self, run: str):
+        """
+        Write a run of regular characters at the cursor, wrapping like write_char.
+
+        Each row's share of the run is copied with one slice assignment.
+
+        Args:
+            run: Characters without newline, carriage return, tab or backspace
+        """
+        rows, cols = self.rows, self.cols
+        screen = self.screen
+        mark_dirty = self._dirty.add
+        row, col = self.cursor_row, self.cursor_col
+        pos, end = 0, len(run)
+        while pos < end:
+            count = min(cols - col, end - pos)
+            base = row * cols + col
+            screen[base:base + count] = run[pos:pos + count]
+            mark_dirty(row)
+            pos += count
+            col += count
+            if col >= cols:
+                col = 0
+                # Clamp cursor to screen bounds (don't scroll beyond)
+                row = min(row + 1, rows - 1)
+        self.cursor_row, self.cursor_col = row, col
+
+    def _write_plain(self, text: str):
+        """
+        Write text containing no escape sequences at the cursor.
+
+        Args:
+            text: Printable characters and control characters
+        """
+        # split() alternates runs of regular characters with single controls
+        parts = _CONTROL_RE.split(text)
+        write_char = self.write_char
+        write_run = self._write_run
+        for i in range(0, len(parts) - 1, 2):
+            if parts[i]:
+                write_run(parts[i])
+            write_char(parts[i + 1])
+        if parts[-1]:
+            write_run(parts[-1])
+
     def process_output(self, output: str):
         """
         Process raw terminal output and update screen buffer.
@@ -218,60 +322,40 @@ class ScreenBuffer:
         Args:
             output: Raw terminal output with ANSI escape sequences
         """
-        i = 0
-        while i < len(output):
-            char = output[i]
-
-            # Check for ANSI escape sequence
-            if char == '\x1b' and i + 1 < len(output):
-                # Find the end of the escape sequence
-                # ESC [ ... letter (CSI sequences)
-                if output[i + 1] == '[':
-                    # Find the final character (letter)
-                    j = i + 2
-                    while j < len(output) and output[j] in '0123456789;?':
-                        j += 1
-                    if j < len(output):
-                        # Found complete sequence
-                        sequence = output[i + 1:j + 1]
-                        self.process_ansi_escape(sequence)
-                        i = j + 1
-                        continue
-
-                # ESC ( ... (character set selection)
-                elif output[i + 1] == '(':
-                    i += 3  # Skip ESC ( X
-                    continue
-
-                # ESC = or ESC > (keypad mode)
-                elif output[i + 1] in '=><':
-                    i += 2
-                    continue
-
-                # ESC ? ... (DEC private mode)
-                elif output[i + 1] == '?':
-                    j = i + 2
-                    while j < len(output) and output[j] not in 'hlH':
-                        j += 1
-                    i = j + 1 if j < len(output) else j
-                    continue
-
-                # Unknown escape sequence, skip 2 chars
-                i += 2
-                continue
-
-            # Regular character
-            self.write_char(char)
-            i += 1
+        # Bound once: escape-heavy output calls these for every match
+        write_plain = self._write_plain
+        get_handler = self._CSI_HANDLERS.get
+        pos = 0
+        for match in _ESC_RE.finditer(output):
+            start, end = match.span()
+            if start > pos:
+                write_plain(output[pos:start])
+            params, final = match.group(1, 2)
+            if final is not None:
+                handler = get_handler(final)
+                if handler is not None:
+                    handler(self, params)
+            pos = end
+        if pos < len(output):
+            write_plain(output[pos:])
 
     def get_screen_lines(self) -> List[str]:
         """
         Get screen contents as list of strings (one per row).
 
+        Only rows written since the previous call are re-rendered.
+
         Returns:
             List of strings, one per row, with trailing spaces stripped
         """
-        return [''.join(row).rstrip() for row in self.screen]
+        if self._dirty:
+            cols = self.cols
+            screen = self.screen
+            for row in self._dirty:
+                base = row * cols
+                self._line_cache[row] = ''.join(screen[base:base + cols]).rstrip()
+            self._dirty.clear()
+        return list(self._line_cache)
 
     def get_screen_text(self) -> str:
         """
@@ -282,6 +366,20 @@ class ScreenBuffer:
         """
         return '\n'.join(self.get_screen_lines())
 
+    def get_screen_text_padded(self) -> str:
+        """
+        Get screen contents as a single string of fixed-width rows.
+
+        Unlike get_screen_text, trailing spaces are kept, so every row is
+        exactly cols characters and no per-row stripping is needed.
+
+        Returns:
+            Screen contents with newlines between rows
+        """
+        cols = self.cols
+        text = ''.join(self.screen)
+        return '\n'.join([text[base:base + cols] for base in range(0, self.rows * cols, cols)])
+
     def __str__(self) -> str:
         """String representation of screen buffer."""
         return self.get_screen_text()
@@ -1,8 +1,14 @@
 """Server entry point for terminal wrapper."""
 
 import argparse
+import socket
+
 import uvicorn
 
+# Idle seconds before closing a keep-alive connection; matches the client's
+# pool expiry so polling clients keep reusing one connection
+KEEP_ALIVE_TIMEOUT = 60
+
 
 def main():
     """Run the FastAPI server."""
@@ -10,19 +16,29 @@ def main():
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to (default: 127.0.0.1 for security)")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--log-level", default="info", help="Log level")
+    parser.add_argument("--fd", type=int, help="Serve on this already bound and listening socket (overrides --host/--port)")
     args = parser.parse_args()
 
+    sockets = None
+    host, port = args.host, args.port
+    if args.fd is not None:
+        sock = socket.socket(fileno=args.fd)
+        sockets = [sock]
+        host, port = sock.getsockname()[:2]
+
     # Display localhost in URL for better UX
-    display_host = "localhost" if args.host in ("127.0.0.1", "localhost") else args.host
-    print(f"Starting server on {args.host}:{args.port}")
-    print(f"Open http://{display_host}:{args.port}/ in your browser")
+    display_host = "localhost" if host in ("127.0.0.1", "localhost") else host
+    print(f"Starting server on {host}:{port}")
+    print(f"Open http://{display_host}:{port}/ in your browser")
 
-    uvicorn.run(
+    config = uvicorn.Config(
         "term_wrapper.api:app",
         host=args.host,
         port=args.port,
         log_level=args.log_level,
+        timeout_keep_alive=KEEP_ALIVE_TIMEOUT,
     )
+    uvicorn.Server(config).run(sockets=sockets)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,79 @@
 """Server manager for auto-starting the term-wrapper server."""
 
 import os
+import select
+import socket
 import subprocess
 import sys
 import time
 import signal
-import httpx
 from pathlib import Path
+from urllib.parse import urlsplit
 import fcntl
+from typing import Optional
+
+# Seconds a server URL found by auto-discovery is trusted without re-checking
+URL_CACHE_TTL = 30.0
+
+# Seconds a newly started server has to answer its first health check
+STARTUP_TIMEOUT = 5.0
+
+# Seconds after a server start during which other invocations trust the state
+# files (and a live PID) without a health check
+FRESH_STATE_TTL = 5.0
+
+# Seconds a server has to exit after SIGTERM before it is killed
+STOP_TIMEOUT = 5.0
+
+
+def _write_state_file(path: Path, text: str) -> None:
+    """Write a state file atomically, so concurrent readers never see it half-written.
+
+    Args:
+        path: File to write
+        text: File contents
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+def _wait_for_exit(pid: int, timeout: float) -> bool:
+    """Wait for a process, which need not be a child, to exit.
+
+    Uses a pidfd where available, so the wait ends as soon as the process
+    exits (even if it stays a zombie), and polls otherwise.
+
+    Args:
+        pid: Process ID
+        timeout: Maximum seconds to wait
+
+    Returns:
+        True if the process exited, False on timeout
+    """
+    try:
+        pidfd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return True
+    except (AttributeError, OSError):
+        pidfd = None
+
+    if pidfd is not None:
+        try:
+            ready, _, _ = select.select([pidfd], [], [], timeout)
+        finally:
+            os.close(pidfd)
+        return bool(ready)
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
 
 
 class ServerManager:
@@ -21,8 +87,11 @@ class ServerManager:
         self.log_file = self.state_dir / "server.log"
         self.lock_file = self.state_dir / "server.lock"
 
-        # Create state directory if it doesn't exist
-        self.state_dir.mkdir(exist_ok=True)
+        # Last auto-discovered server URL, when it was found (time.monotonic())
+        # and the port file's modification time (st_mtime_ns) it came from
+        self._cached_url: Optional[str] = None
+        self._cached_at = 0.0
+        self._cached_mtime: Optional[int] = None
 
     def get_server_url(self, host: str = None, port: int = None) -> str:
         """Get the server URL, starting server if needed.
@@ -38,35 +107,99 @@ class ServerManager:
         if host is not None or port is not None:
             return self._start_server_with_lock(host=host or "127.0.0.1", port=port or 0)
 
-        # Try to read existing port (auto-discovery mode)
-        if self.port_file.exists():
-            try:
-                port = int(self.port_file.read_text().strip())
-                url = f"http://localhost:{port}"
+        # Reuse a recently verified server without another round-trip, unless
+        # the port file changed (e.g. another process restarted the server)
+        if (self._cached_url is not None
+                and time.monotonic() - self._cached_at < URL_CACHE_TTL
+                and self._port_file_mtime() == self._cached_mtime):
+            return self._cached_url
 
-                # Verify server is actually running
-                if self._is_server_running(url):
-                    return url
-            except (ValueError, OSError):
-                pass
+        url = self._discover_server()
+        if url is None:
+            # Server not running, start it with file locking
+            url = self._start_server_with_lock(host="127.0.0.1", port=0)
+
+        self._cached_url = url
+        self._cached_at = time.monotonic()
+        self._cached_mtime = self._port_file_mtime()
+        return url
+
+    def _port_file_mtime(self) -> Optional[int]:
+        """Get the port file's modification time.
+
+        Returns:
+            st_mtime_ns of the port file, or None if it doesn't exist
+        """
+        try:
+            return self.port_file.stat().st_mtime_ns
+        except OSError:
+            return None
 
-        # Server not running, start it with file locking
-        return self._start_server_with_lock(host="127.0.0.1", port=0)
+    def _discover_server(self) -> Optional[str]:
+        """Find a running server from the port file.
 
-    def _is_server_running(self, url: str) -> bool:
+        Returns:
+            Server URL, or None if no server is running
+        """
+        try:
+            port = int(self.port_file.read_text().strip())
+        except (ValueError, OSError):
+            return None
+        url = f"http://localhost:{port}"
+
+        # A server started moments ago was checked before its port file was
+        # written; if its process is still there, skip the round-trip
+        if self._is_fresh_start():
+            return url
+
+        # Verify server is actually running
+        return url if self._is_server_running(url) else None
+
+    def _is_fresh_start(self) -> bool:
+        """Check whether the state files are from a server started moments ago that is still alive.
+
+        Returns:
+            True if the port and PID files are younger than FRESH_STATE_TTL
+            and the PID exists
+        """
+        try:
+            pid = int(self.pid_file.read_text().strip())
+            written_at = min(self.port_file.stat().st_mtime, self.pid_file.stat().st_mtime)
+        except (ValueError, OSError):
+            return False
+        if time.time() - written_at >= FRESH_STATE_TTL:
+            return False
+        try:
+            os.kill(pid, 0)  # Signal 0 just checks if process exists
+        except OSError:
+            return False
+        return True
+
+    def _is_server_running(self, url: str, timeout: float = 1.0) -> bool:
         """Check if server is running at the given URL.
 
         Args:
             url: Server URL to check
+            timeout: Seconds to wait for the response (connecting is always
+                limited to 1 second)
 
         Returns:
             True if server is responding
         """
+        # A bare HTTP/1.0 request answers the question without the cost of
+        # setting up an HTTP client for a single local request
+        parts = urlsplit(url)
+        request = f"GET /health HTTP/1.0\r\nHost: {parts.netloc}\r\n\r\n".encode()
         try:
-            response = httpx.get(f"{url}/health", timeout=1.0)
-            return response.status_code == 200
-        except (httpx.ConnectError, httpx.TimeoutException):
+            with socket.create_connection((parts.hostname, parts.port), timeout=1.0) as sock:
+                sock.settimeout(timeout)
+                sock.sendall(request)
+                with sock.makefile("rb") as response:
+                    status_line = response.readline()
+        except OSError:
             return False
+        # e.g. b"HTTP/1.1 200 OK\r\n"
+        return status_line.split(b" ", 2)[1:2] == [b"200"]
 
     def _start_server_with_lock(self, host: str, port: int) -> str:
         """Start server with file locking to prevent concurrent starts.
@@ -78,6 +211,9 @@ class ServerManager:
         Returns:
             Server URL
         """
+        # The state directory is only needed once a server has to be started
+        self.state_dir.mkdir(exist_ok=True)
+
         # Use file locking to prevent concurrent server starts
         lock_fd = open(self.lock_file, 'w')
         try:
@@ -86,14 +222,10 @@ class ServerManager:
 
             # Double-check server isn't running (another process might have started it)
             # Only check if using auto-discovery (port 0 and localhost)
-            if host == "127.0.0.1" and port == 0 and self.port_file.exists():
-                try:
-                    existing_port = int(self.port_file.read_text().strip())
-                    url = f"http://localhost:{existing_port}"
-                    if self._is_server_running(url):
-                        return url
-                except (ValueError, OSError):
-                    pass
+            if host == "127.0.0.1" and port == 0:
+                url = self._discover_server()
+                if url is not None:
+                    return url
 
             # Start the server
             return self._start_server(host=host, port=port)
@@ -104,14 +236,9 @@ class ServerManager:
 
             # Read the port file that the other process should have created
             for _ in range(50):  # Wait up to 5 seconds
-                if self.port_file.exists():
-                    try:
-                        port = int(self.port_file.read_text().strip())
-                        url = f"http://localhost:{port}"
-                        if self._is_server_running(url):
-                            return url
-                    except (ValueError, OSError):
-                        pass
+                url = self._discover_server()
+                if url is not None:
+                    return url
                 time.sleep(0.1)
 
             raise RuntimeError("Server started by another process but couldn't connect")
@@ -122,80 +249,64 @@ class ServerManager:
     def _start_server(self, host: str, port: int) -> str:
         """Start the server in background.
 
+        The listening socket is bound here and handed to the server process,
+        so the port is known up front. Connections made before the server is
+        ready wait in the socket's backlog, so a single health check returns
+        as soon as the server can answer.
+
         Args:
             host: Host to bind to
             port: Port to bind to (0 = auto-assign)
 
         Returns:
             Server URL
+
+        Raises:
+            RuntimeError: If server exits or doesn't start within STARTUP_TIMEOUT
         """
+        family = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][0]
+        sock = socket.create_server((host, port), family=family)
+        actual_port = sock.getsockname()[1]
+
         # Start server
         log_file = open(self.log_file, "w")
 
-        # Use python -m to run the server module
-        process = subprocess.Popen(
-            [sys.executable, "-m", "term_wrapper.server", "--host", host, "--port", str(port)],
-            stdout=log_file,
-            stderr=subprocess.STDOUT,
-            start_new_session=True,  # Detach from parent
-        )
+        try:
+            # Use python -m to run the server module
+            process = subprocess.Popen(
+                [sys.executable, "-m", "term_wrapper.server", "--fd", str(sock.fileno())],
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                pass_fds=(sock.fileno(),),
+                start_new_session=True,  # Detach from parent
+            )
+        finally:
+            # The server process holds its own copies
+            log_file.close()
+            sock.close()
 
         # Save PID
-        self.pid_file.write_text(str(process.pid))
-
-        # Wait for server to start and parse port from log
-        actual_port, actual_host = self._wait_for_server_start()
-
-        # Save port (for auto-discovery)
-        self.port_file.write_text(str(actual_port))
+        _write_state_file(self.pid_file, str(process.pid))
 
         # Return URL with the appropriate host
-        display_host = "localhost" if actual_host in ("127.0.0.1", "0.0.0.0", "localhost") else actual_host
-        return f"http://{display_host}:{actual_port}"
-
-    def _wait_for_server_start(self, timeout: float = 5.0) -> tuple[int, str]:
-        """Wait for server to start and extract the port and host.
-
-        Args:
-            timeout: Maximum time to wait in seconds
+        display_host = "localhost" if host in ("127.0.0.1", "0.0.0.0", "localhost") else host
+        url = f"http://{display_host}:{actual_port}"
 
-        Returns:
-            Tuple of (port, host) the server is listening on
+        if not self._is_server_running(url, timeout=STARTUP_TIMEOUT):
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Server exited during startup (exit code {process.returncode}). "
+                    f"Check log file: {self.log_file}"
+                )
+            raise RuntimeError(
+                f"Server failed to start within {STARTUP_TIMEOUT}s. "
+                f"Check log file: {self.log_file}"
+            )
 
-        Raises:
-            RuntimeError: If server doesn't start within timeout
-        """
-        start_time = time.time()
+        # Save port (for auto-discovery) only once the server answers
+        _write_state_file(self.port_file, str(actual_port))
 
-        while time.time() - start_time < timeout:
-            if self.log_file.exists():
-                try:
-                    log_content = self.log_file.read_text()
-
-                    # Look for "Uvicorn running on http://HOST:PORT" in log
-                    for line in log_content.splitlines():
-                        if "Uvicorn running on" in line:
-                            # Extract host and port from "http://HOST:PORT"
-                            if "http://" in line:
-                                url_part = line.split("http://")[1].split()[0]
-                                host_port = url_part.rsplit(":", 1)
-                                if len(host_port) == 2:
-                                    host, port_str = host_port
-                                    port = int(port_str)
-
-                                    # Verify server is responding
-                                    check_host = "localhost" if host in ("127.0.0.1", "0.0.0.0") else host
-                                    if self._is_server_running(f"http://{check_host}:{port}"):
-                                        return (port, host)
-                except (OSError, ValueError, IndexError):
-                    pass
-
-            time.sleep(0.1)
-
-        raise RuntimeError(
-            f"Server failed to start within {timeout}s. "
-            f"Check log file: {self.log_file}"
-        )
+        return url
 
     def stop_server(self) -> dict:
         """Stop the running server.
@@ -224,19 +335,13 @@ class ServerManager:
         try:
             os.kill(pid, signal.SIGTERM)
 
-            # Wait for process to exit (up to 5 seconds)
-            for _ in range(50):
-                try:
-                    os.kill(pid, 0)
-                    time.sleep(0.1)
-                except OSError:
-                    # Process has exited
-                    self._cleanup_state_files()
-                    return {"status": "stopped", "message": f"Server (PID {pid}) stopped successfully"}
+            if _wait_for_exit(pid, STOP_TIMEOUT):
+                self._cleanup_state_files()
+                return {"status": "stopped", "message": f"Server (PID {pid}) stopped successfully"}
 
             # Force kill if still running
             os.kill(pid, signal.SIGKILL)
-            time.sleep(0.5)
+            _wait_for_exit(pid, 0.5)
             self._cleanup_state_files()
             return {"status": "stopped", "message": f"Server (PID {pid}) force-stopped"}
 
@@ -245,6 +350,7 @@ class ServerManager:
 
     def _cleanup_state_files(self):
         """Clean up state files."""
+        self._cached_url = None
         for file in [self.port_file, self.pid_file]:
             if file.exists():
                 try:
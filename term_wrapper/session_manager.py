@@ -1,10 +1,32 @@
 """Terminal session manager."""
 
 import asyncio
+import codecs
+import time
 import uuid
 from typing import Dict, Optional
-from .terminal import Terminal
+from .terminal import Terminal, READ_SIZE
 from .screen_buffer import ScreenBuffer
+from .utils import incomplete_ansi_start
+
+# Most output bytes a session buffers; beyond this the oldest bytes are dropped
+# so a session nobody reads from cannot grow without bound
+OUTPUT_BUFFER_LIMIT = 8 * 1024 * 1024
+
+# Most output bytes left pending for the screen; past this, output before
+# the last full-screen clear is dropped unless the screen is in use, and
+# whatever is still pending is rendered right away
+SCREEN_REPLAY_LIMIT = 1024 * 1024
+
+# Full-screen clear (ESC [ 2 J): the screen no longer depends on any output
+# before it, except for a cursor position saved with ESC [ s
+_CLEAR_SCREEN = b'\x1b[2J'
+_SAVE_CURSOR = b'\x1b[s'
+
+# Most chunks queued for one output stream subscriber (each chunk is at most
+# one PTY read, so this bounds it like OUTPUT_BUFFER_LIMIT); a subscriber
+# that falls further behind is dropped
+STREAM_QUEUE_LIMIT = OUTPUT_BUFFER_LIMIT // READ_SIZE
 
 
 class TerminalSession:
@@ -23,9 +45,20 @@ class TerminalSession:
         self.session_id = session_id
         self.terminal = terminal
         self.command = command or []
-        self.output_buffer: list[bytes] = []
+        self.output_buffer = bytearray()
+        self.output_start = 0  # Stream offset of the first byte in output_buffer
         self.screen_buffer = ScreenBuffer(rows, cols)
-        self.lock = asyncio.Lock()
+        self.screen_version = 0  # Bumped whenever output may have changed the screen
+        # Keeps multi-byte characters split across PTY reads intact for the screen
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        # Output not yet applied to screen_buffer; it is rendered in batches
+        # when the screen is read, so parsing stays off the PTY read path.
+        # Until the screen is first read, output a later full-screen clear
+        # wipes out is dropped unparsed.
+        self._screen_enabled = False
+        self._screen_pending = bytearray()
+        self.listeners: set[asyncio.Queue] = set()  # Output stream subscribers
+        self.last_output_time = time.monotonic()  # When output last arrived
 
     def add_output(self, data: bytes) -> None:
         """Add output data to buffer and update screen buffer.
@@ -33,29 +66,204 @@ class TerminalSession:
         Args:
             data: Output bytes from terminal
         """
-        self.output_buffer.append(data)
-        # Update screen buffer with decoded output
+        self.output_buffer += data
+        excess = len(self.output_buffer) - OUTPUT_BUFFER_LIMIT
+        if excess > 0:
+            # Deleting from the front of a bytearray doesn't move the rest
+            del self.output_buffer[:excess]
+            self.output_start += excess
+        self.last_output_time = time.monotonic()
+        self.screen_version += 1
+        if self.listeners:
+            for queue in [queue for queue in self.listeners if queue.full()]:
+                self._drop_listener(queue)
+            for queue in self.listeners:
+                queue.put_nowait(data)
+        self._screen_pending += data
+        if len(self._screen_pending) > SCREEN_REPLAY_LIMIT:
+            self._trim_screen_pending()
+
+    def _trim_screen_pending(self) -> None:
+        """Keep pending screen output bounded without changing the screen.
+
+        Before the screen is in use, output up to the last full-screen clear
+        is dropped, since the rendered screen would not depend on it. The cut
+        is at an ESC, so it never splits an escape sequence or a UTF-8
+        character. Output that cannot be dropped is rendered instead.
+        """
+        pending = self._screen_pending
+        if not self._screen_enabled:
+            clear = pending.rfind(_CLEAR_SCREEN)
+            if clear > 0 and pending.find(_SAVE_CURSOR, 0, clear) == -1:
+                del pending[:clear]
+        if len(pending) > SCREEN_REPLAY_LIMIT:
+            self._render_pending()
+
+    def update_screen(self) -> None:
+        """Bring screen_buffer up to date with the output.
+
+        Parsing escape sequences is the main per-byte cost of a session, so
+        it is done here, in one batch per screen read, rather than for every
+        chunk of output. The first call replays the output kept so far.
+        """
+        self._screen_enabled = True
+        self._render_pending()
+
+    def _render_pending(self) -> None:
+        """Apply pending output to screen_buffer.
+
+        An escape sequence cut off at the end stays pending until the rest
+        of it arrives, so it is not rendered as text.
+        """
+        cut = incomplete_ansi_start(self._screen_pending)
+        if not cut:
+            return
+        data = bytes(self._screen_pending[:cut])
+        del self._screen_pending[:cut]
         try:
-            text = data.decode('utf-8', errors='replace')
-            self.screen_buffer.process_output(text)
+            self.screen_buffer.process_output(self._decoder.decode(data))
         except Exception:
-            # If decoding fails, skip screen buffer update
+            # Skip output the screen buffer cannot handle
             pass
 
     async def get_output(self, clear: bool = True) -> bytes:
         """Get accumulated output.
 
+        Output is only added from the event loop thread and nothing here
+        awaits, so reading and clearing need no lock.
+
         Args:
             clear: Whether to clear the buffer after reading
 
         Returns:
             Accumulated output bytes
         """
-        async with self.lock:
-            output = b"".join(self.output_buffer)
-            if clear:
-                self.output_buffer.clear()
-            return output
+        output = bytes(self.output_buffer)
+        if clear:
+            self.output_buffer.clear()
+            self.output_start += len(output)
+        return output
+
+    @property
+    def output_end(self) -> int:
+        """Stream offset just past the last buffered byte."""
+        return self.output_start + len(self.output_buffer)
+
+    async def get_output_from(self, offset: int, base: Optional[int] = None) -> tuple[int, int, bytes]:
+        """Get buffered output from a stream offset on, without clearing.
+
+        Offsets count every byte the terminal produced, so they stay valid
+        across clears. If offset is no longer (or not yet) buffered, or the
+        buffer no longer starts at base, the whole buffer is returned instead.
+
+        Args:
+            offset: Stream offset to read from
+            base: Stream offset where the caller's copy of the buffer begins
+
+        Returns:
+            Tuple of (stream offset of the buffer start, stream offset of the
+            returned data, output bytes)
+        """
+        start = self.output_start
+        if not start <= offset <= self.output_end or (base is not None and base != start):
+            offset = start
+        with memoryview(self.output_buffer) as view:
+            return start, offset, bytes(view[offset - start:])
+
+    async def wait_for_quiet(self, duration: float, timeout: float) -> bool:
+        """Wait until no output has arrived for a while.
+
+        Sleeps until the earliest moment the session could be quiet and
+        rechecks, so waiting costs one wakeup per output burst.
+
+        Args:
+            duration: Seconds without output required
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the session went quiet, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            quiet_at = self.last_output_time + duration
+            if now >= quiet_at:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(min(quiet_at, deadline) - now)
+
+    async def wait_for_output(self, timeout: float) -> bytes:
+        """Wait until the session has produced some output.
+
+        Returns at once if output is already buffered, otherwise as soon as
+        the first chunk arrives. Does not clear the buffer.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Buffered output bytes (empty if none arrived in time)
+        """
+        if not self.output_buffer and self.terminal.is_reading():
+            _, queue = self.subscribe()
+            try:
+                await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self.unsubscribe(queue)
+        return bytes(self.output_buffer)
+
+    def end_output(self) -> None:
+        """Tell output subscribers that the terminal stopped producing output.
+
+        Each queue receives b"", like a read at end of file.
+        """
+        for queue in list(self.listeners):
+            if queue.full():
+                self._drop_listener(queue)
+            else:
+                queue.put_nowait(b"")
+
+    def subscribe(self) -> tuple[bytes, asyncio.Queue]:
+        """Subscribe to output without consuming the buffer.
+
+        The snapshot and the registration happen without yielding to the
+        event loop, so no chunk can fall between them.
+
+        Returns:
+            Tuple of (currently buffered output, queue receiving every later
+            chunk, then b"" once the terminal stops producing output, or None
+            once the subscriber was dropped for falling behind)
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_LIMIT)
+        self.listeners.add(queue)
+        if not self.terminal.is_reading():
+            queue.put_nowait(b"")
+        return bytes(self.output_buffer), queue
+
+    def _drop_listener(self, queue: asyncio.Queue) -> None:
+        """Drop a subscriber whose queue is full.
+
+        Its queued output is discarded and replaced by None, telling the
+        stream to close.
+
+        Args:
+            queue: Subscriber queue
+        """
+        self.listeners.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering output to a queue returned by subscribe().
+
+        Args:
+            queue: Subscriber queue
+        """
+        self.listeners.discard(queue)
 
 
 class SessionManager:
@@ -88,6 +296,7 @@ class SessionManager:
 
         session = TerminalSession(session_id, terminal, rows, cols, command)
         terminal.output_callback = session.add_output
+        terminal.output_end_callback = session.end_output
 
         terminal.spawn(command, env)
 
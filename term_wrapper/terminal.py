@@ -1,15 +1,68 @@
 """PTY-based terminal emulator."""
 
 import asyncio
+import errno
+import functools
 import os
 import pty
 import select
 import signal
+import stat
 import struct
+import sys
 import fcntl
 import termios
 from typing import Callable, Optional
 
+# Bytes requested per PTY read; large enough to drain a full PTY buffer at once
+READ_SIZE = 65536
+
+# Most input bytes queued for a process that is not reading its input;
+# further writes are refused until it catches up
+WRITE_BUFFER_LIMIT = 8 * 1024 * 1024
+
+# Most seconds a write waits for the process to take more input when no
+# event loop is running to queue it
+BLOCKING_WRITE_TIMEOUT = 10.0
+
+_INPUT_FULL_MESSAGE = "Terminal input buffer is full; the process is not reading its input"
+
+# struct winsize (rows, cols, xpixel, ypixel) for TIOCSWINSZ
+_WINSIZE = struct.Struct("HHHH")
+
+# posix_spawn avoids copying the server's page tables on every session start.
+# Only Linux makes the PTY the controlling terminal when the new session leader
+# opens it; elsewhere pty.fork() sets it up.
+_USE_POSIX_SPAWN = sys.platform.startswith('linux') and hasattr(os, 'posix_spawnp')
+
+
+@functools.lru_cache(maxsize=256)
+def _needs_bash_wrap(path: str, mtime_ns: int, size: int, mode: int) -> bool:
+    """Check whether an executable file is a script without a shebang.
+
+    Cached per file version (modification time, size and mode are part of
+    the key), so sessions repeatedly running the same script skip the read.
+
+    Args:
+        path: Path of the command
+        mtime_ns: Modification time of the file
+        size: Size of the file
+        mode: Mode bits of the file
+
+    Returns:
+        True if the file should be run through bash
+    """
+    try:
+        with open(path, 'rb') as f:
+            first_bytes = f.read(512)  # Read more to check if it's text
+    except OSError:
+        return False  # If we can't read it, let exec try
+    # Skip if it's a binary (ELF, compiled executable, etc.)
+    if first_bytes.startswith(b'\x7fELF') or b'\x00' in first_bytes[:256]:
+        return False
+    # If file doesn't start with shebang (#!) and looks like text, wrap in bash
+    return first_bytes[:2] != b'#!' and os.access(path, os.X_OK)
+
 
 class Terminal:
     """A pseudo-terminal that can run TUI applications."""
@@ -26,8 +79,21 @@ class Terminal:
         self.master_fd: Optional[int] = None
         self.pid: Optional[int] = None
         self.output_callback: Optional[Callable[[bytes], None]] = None
+        # Called once reading stops (end of output, or kill)
+        self.output_end_callback: Optional[Callable[[], None]] = None
         self._running = False
-        self._read_task: Optional[asyncio.Task] = None
+        # Event loop the PTY is registered with for reading, while it is
+        self._reader_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Input the PTY could not take yet, and the loop waiting to write it
+        self._write_buffer = bytearray()
+        self._writer_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Raw wait status once the process has been reaped
+        self._exit_status: Optional[int] = None
+        # pidfd the event loop watches for the process exit, the loop, and
+        # the future resolved on exit (see _watch_exit)
+        self._pidfd: Optional[int] = None
+        self._exit_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._exit_future: Optional[asyncio.Future] = None
 
     def spawn(self, command: list[str], env: Optional[dict] = None, raw_mode: bool = True) -> None:
         """Spawn a process in the terminal.
@@ -41,76 +107,112 @@ class Terminal:
             raise RuntimeError("Terminal already has a running process")
 
         # Auto-detect scripts without shebangs and wrap in bash
-        if command and os.path.exists(command[0]) and os.path.isfile(command[0]):
+        if command:
+            try:
+                st = os.stat(command[0])
+            except OSError:
+                st = None  # Not a path; let the PATH lookup find it
+            if (st is not None and stat.S_ISREG(st.st_mode)
+                    and _needs_bash_wrap(command[0], st.st_mtime_ns, st.st_size, st.st_mode)):
+                command = ['bash', command[0]] + command[1:]
+
+        spawn_env = {**os.environ, **env} if env else dict(os.environ)
+
+        spawn = self._posix_spawn if _USE_POSIX_SPAWN else self._fork_spawn
+        try:
+            self.pid, self.master_fd = spawn(command, spawn_env)
+        except OSError as e:
+            raise RuntimeError(
+                f"Command failed to start ({e}). "
+                f"Command: {command}. "
+                f"Try wrapping in a shell: ['bash', '-c', '{' '.join(command)}']"
+            ) from e
+
+        self._set_terminal_size(self.rows, self.cols)
+        self._running = True
+
+        # Set the PTY to raw mode if requested (needed for TUI apps)
+        if raw_mode:
             try:
-                with open(command[0], 'rb') as f:
-                    first_bytes = f.read(512)  # Read more to check if it's text
-                    # Skip if it's a binary (ELF, compiled executable, etc.)
-                    if first_bytes.startswith(b'\x7fELF') or b'\x00' in first_bytes[:256]:
-                        pass  # It's binary, let execvp handle it
-                    # If file doesn't start with shebang (#!) and looks like text, wrap in bash
-                    elif first_bytes[:2] != b'#!' and os.access(command[0], os.X_OK):
-                        command = ['bash', command[0]] + command[1:]
-            except (OSError, IOError):
-                pass  # If we can't read it, let execvp try
-
-        # Create PTY
-        self.pid, self.master_fd = pty.fork()
-
-        if self.pid == 0:
+                import tty
+                # Set to raw mode for proper TUI app support
+                tty.setraw(self.master_fd)
+            except Exception:
+                # If raw mode fails, continue anyway
+                pass
+
+        # Set non-blocking mode
+        flags = fcntl.fcntl(self.master_fd, fcntl.F_GETFL)
+        fcntl.fcntl(self.master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+    @staticmethod
+    def _posix_spawn(command: list[str], env: dict) -> tuple[int, int]:
+        """Start a process on a new PTY without forking the interpreter.
+
+        Args:
+            command: Command and arguments to execute
+            env: Complete environment for the process
+
+        Returns:
+            Tuple of (process ID, PTY master file descriptor)
+
+        Raises:
+            OSError: If the command cannot be executed
+        """
+        master_fd, slave_fd = pty.openpty()
+        try:
+            pid = os.posix_spawnp(command[0], command, env, setsid=True, file_actions=[
+                # Opening the slave from the new session leader makes it the
+                # controlling terminal, like pty.fork() does
+                (os.POSIX_SPAWN_OPEN, 0, os.ttyname(slave_fd), os.O_RDWR, 0),
+                (os.POSIX_SPAWN_DUP2, 0, 1),
+                (os.POSIX_SPAWN_DUP2, 0, 2),
+            ])
+        except BaseException:
+            os.close(master_fd)
+            raise
+        finally:
+            os.close(slave_fd)
+        return pid, master_fd
+
+    @staticmethod
+    def _fork_spawn(command: list[str], env: dict) -> tuple[int, int]:
+        """Start a process on a new PTY with pty.fork().
+
+        Exec failures are reported back over a pipe that a successful exec
+        closes, so they are known as soon as the exec happened.
+
+        Args:
+            command: Command and arguments to execute
+            env: Complete environment for the process
+
+        Returns:
+            Tuple of (process ID, PTY master file descriptor)
+
+        Raises:
+            OSError: If the command cannot be executed
+        """
+        errpipe_read, errpipe_write = os.pipe()
+        pid, master_fd = pty.fork()
+
+        if pid == 0:
             # Child process
             try:
-                if env:
-                    os.environ.update(env)
-                os.execvp(command[0], command)
+                os.execvpe(command[0], command, env)
             except Exception as e:
-                # If exec fails, print error and exit child process
-                import sys
-                print(f"Failed to execute command: {e}", file=sys.stderr)
-                sys.exit(1)
-        else:
-            # Parent process
-            self._set_terminal_size(self.rows, self.cols)
-            self._running = True
-
-            # Set the PTY to raw mode if requested (needed for TUI apps)
-            if raw_mode:
-                try:
-                    import tty
-                    # Set to raw mode for proper TUI app support
-                    tty.setraw(self.master_fd)
-                except Exception:
-                    # If raw mode fails, continue anyway
-                    pass
-
-            # Set non-blocking mode
-            flags = fcntl.fcntl(self.master_fd, fcntl.F_GETFL)
-            fcntl.fcntl(self.master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
-
-            # Check if child process failed to start
-            import time
-            time.sleep(0.1)  # Give child a moment to start
-            try:
-                pid, status = os.waitpid(self.pid, os.WNOHANG)
-                if pid != 0:
-                    # Child exited immediately
-                    exit_code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
-                    if exit_code != 0:
-                        # Non-zero exit = command failed to start
-                        self._running = False
-                        os.close(self.master_fd)
-                        self.master_fd = None
-                        raise RuntimeError(
-                            f"Command failed to start (exit code {exit_code}). "
-                            f"Command: {command}. "
-                            f"This may indicate: (1) command not found, (2) exec format error, "
-                            f"or (3) missing dependencies. Try wrapping in a shell: "
-                            f"['bash', '-c', '{' '.join(command)}']"
-                        )
-                    # else: exit code 0 means command ran successfully and finished quickly
-                    # Let start_reading() handle it normally - don't mark as not running
-            except ChildProcessError:
-                pass  # Child is still running, which is good
+                os.write(errpipe_write, str(e).encode())
+            os._exit(127)
+
+        os.close(errpipe_write)
+        try:
+            error = os.read(errpipe_read, 4096)
+        finally:
+            os.close(errpipe_read)
+        if error:
+            os.waitpid(pid, 0)
+            os.close(master_fd)
+            raise OSError(error.decode(errors='replace'))
+        return pid, master_fd
 
     def _set_terminal_size(self, rows: int, cols: int) -> None:
         """Set the terminal window size.
@@ -122,8 +224,7 @@ class Terminal:
         if self.master_fd is None:
             return
 
-        size = struct.pack("HHHH", rows, cols, 0, 0)
-        fcntl.ioctl(self.master_fd, termios.TIOCSWINSZ, size)
+        fcntl.ioctl(self.master_fd, termios.TIOCSWINSZ, _WINSIZE.pack(rows, cols, 0, 0))
 
     def resize(self, rows: int, cols: int) -> None:
         """Resize the terminal.
@@ -144,89 +245,248 @@ class Terminal:
                 pass
 
     async def start_reading(self) -> None:
-        """Start asynchronously reading from the terminal."""
+        """Start asynchronously reading from the terminal.
+
+        The PTY is watched by the running event loop itself, so output is
+        delivered to output_callback as soon as it is readable, without a
+        polling thread.
+        """
         if not self._running or self.master_fd is None:
             raise RuntimeError("No process running in terminal")
 
-        self._read_task = asyncio.create_task(self._read_loop())
+        self._reader_loop = asyncio.get_running_loop()
+        self._reader_loop.add_reader(self.master_fd, self._on_readable)
+        self._watch_exit(self._reader_loop)
 
-    async def _read_loop(self) -> None:
-        """Continuously read output from the terminal."""
-        loop = asyncio.get_event_loop()
+    def _on_readable(self) -> None:
+        """Read available output from the PTY and pass it to output_callback.
 
-        while self._running:
+        A single PTY read returns at most one line-discipline buffer (4 KiB
+        on Linux), so reads repeat until the PTY is drained or READ_SIZE
+        bytes are collected, and the result is delivered as one chunk.
+        """
+        chunks = []
+        size = 0
+        eof = False
+        while size < READ_SIZE:
             try:
-                # Use select to wait for data
-                ready, _, _ = await loop.run_in_executor(
-                    None, select.select, [self.master_fd], [], [], 0.1
-                )
+                data = os.read(self.master_fd, READ_SIZE - size)
+            except BlockingIOError:
+                break
+            except OSError:
+                # EIO once the process side of the PTY is closed
+                data = b""
+            if not data:
+                eof = True
+                break
+            chunks.append(data)
+            size += len(data)
+
+        if chunks and self.output_callback:
+            self.output_callback(chunks[0] if len(chunks) == 1 else b"".join(chunks))
 
-                if ready:
-                    data = os.read(self.master_fd, 4096)
-                    if not data:
-                        # EOF - process has terminated
-                        self._running = False
-                        break
+        if eof:
+            # Process has terminated
+            self._running = False
+            self._stop_reading()
 
-                    if self.output_callback:
-                        self.output_callback(data)
+    def _stop_reading(self) -> None:
+        """Unregister the PTY from the event loop and call output_end_callback."""
+        if self._reader_loop is not None:
+            self._reader_loop.remove_reader(self.master_fd)
+            self._reader_loop = None
+            if self.output_end_callback:
+                self.output_end_callback()
 
-            except OSError:
-                # Process terminated
-                self._running = False
-                break
+    def is_reading(self) -> bool:
+        """Check if output is still being read.
+
+        Returns:
+            True while output may still be delivered to output_callback
+        """
+        return self._reader_loop is not None
 
     def write(self, data: bytes) -> None:
         """Write data to the terminal input.
 
+        Data is written immediately when the PTY can take it. Whatever does
+        not fit (e.g. a large paste) is kept and written by the running event
+        loop as the process reads its input, preserving order. Without a
+        running loop, the call blocks until the process has taken it all,
+        or until it has taken nothing for BLOCKING_WRITE_TIMEOUT seconds.
+
         Args:
             data: Bytes to write to terminal
+
+        Raises:
+            RuntimeError: If no process is running
+            BlockingIOError: If the input would leave more than
+                WRITE_BUFFER_LIMIT bytes waiting for the process to read
+                them, or a blocking write timed out; characters_written is
+                the number of bytes of data already written
         """
         if not self._running or self.master_fd is None:
             raise RuntimeError("No process running in terminal")
 
-        os.write(self.master_fd, data)
+        if self._write_buffer:
+            # Earlier input is still queued; write after it
+            if len(self._write_buffer) + len(data) > WRITE_BUFFER_LIMIT:
+                raise BlockingIOError(errno.EAGAIN, _INPUT_FULL_MESSAGE, 0)
+            self._write_buffer += data
+            return
+
+        try:
+            written = os.write(self.master_fd, data)
+        except BlockingIOError:
+            written = 0
+        if written == len(data):
+            return
+        rest = memoryview(data)[written:]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_blocking(rest, written)
+            return
+        if len(rest) > WRITE_BUFFER_LIMIT:
+            raise BlockingIOError(errno.EAGAIN, _INPUT_FULL_MESSAGE, written)
+        # Register first, so a failure leaves nothing queued that no one writes
+        loop.add_writer(self.master_fd, self._on_writable)
+        self._writer_loop = loop
+        self._write_buffer += rest
+
+    def _write_blocking(self, data: memoryview, written: int) -> None:
+        """Write all of data, waiting for the PTY to take it.
+
+        Args:
+            data: Bytes still to write
+            written: Bytes of the caller's input already written
+
+        Raises:
+            BlockingIOError: If the PTY takes nothing for BLOCKING_WRITE_TIMEOUT seconds
+        """
+        while data:
+            if not select.select([], [self.master_fd], [], BLOCKING_WRITE_TIMEOUT)[1]:
+                raise BlockingIOError(errno.EAGAIN, _INPUT_FULL_MESSAGE, written)
+            try:
+                count = os.write(self.master_fd, data)
+            except BlockingIOError:
+                continue
+            data = data[count:]
+            written += count
+
+    def _on_writable(self) -> None:
+        """Write queued input once the PTY can take more."""
+        try:
+            written = os.write(self.master_fd, self._write_buffer)
+        except BlockingIOError:
+            return
+        except OSError:
+            # The process is gone; nobody will read the rest
+            self._write_buffer.clear()
+            written = 0
+        del self._write_buffer[:written]
+        if not self._write_buffer:
+            self._stop_writing()
+
+    def _stop_writing(self) -> None:
+        """Unregister the PTY from the event loop for writing."""
+        if self._writer_loop is not None:
+            self._writer_loop.remove_writer(self.master_fd)
+            self._writer_loop = None
+
+    def _watch_exit(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Have the event loop reap the process as soon as it exits.
+
+        A pidfd becomes readable when its process exits, so the exit is
+        noticed without a thread or repeated waitpid calls. Without pidfd
+        support (non-Linux) nothing is registered and is_alive() and wait()
+        fall back to waitpid.
+
+        Args:
+            loop: Event loop to watch the process on
+        """
+        if self._exit_loop is loop or self._exit_status is not None:
+            return
+        self._stop_watching_exit()
+        try:
+            self._pidfd = os.pidfd_open(self.pid)
+        except (AttributeError, OSError):
+            return
+        self._exit_loop = loop
+        self._exit_future = loop.create_future()
+        loop.add_reader(self._pidfd, self._reap, 0)
+
+    def _stop_watching_exit(self) -> None:
+        """Unregister and close the pidfd watched by _watch_exit."""
+        if self._pidfd is not None:
+            self._exit_loop.remove_reader(self._pidfd)
+            os.close(self._pidfd)
+            self._pidfd = None
+            self._exit_loop = None
+            self._exit_future = None
+
+    def _reap(self, options: int) -> bool:
+        """Collect the exit status of the process if it has exited.
+
+        Args:
+            options: Flags for os.waitpid (os.WNOHANG not to block)
+
+        Returns:
+            True if the process has exited
+        """
+        if self._exit_status is not None:
+            return True
+        try:
+            pid, status = os.waitpid(self.pid, options)
+        except ChildProcessError:
+            # Reaped elsewhere; the exit code is lost
+            pid, status = self.pid, 0
+        if pid == 0:
+            return False
+
+        self._exit_status = status
+        self._running = False
+        if self._exit_future is not None and not self._exit_future.done():
+            self._exit_future.set_result(None)
+        self._stop_watching_exit()
+        return True
 
     def is_alive(self) -> bool:
         """Check if the terminal process is still running.
 
+        While a running event loop watches the process (see _watch_exit),
+        this is a flag check; otherwise it polls waitpid.
+
         Returns:
             True if process is running, False otherwise
         """
         if not self._running or self.pid is None:
             return False
-
-        try:
-            pid, status = os.waitpid(self.pid, os.WNOHANG)
-            if pid == 0:
-                return True
-            self._running = False
-            return False
-        except ChildProcessError:
-            self._running = False
-            return False
+        if self._exit_loop is not None and self._exit_loop.is_running():
+            return True
+        return not self._reap(os.WNOHANG)
 
     def kill(self) -> None:
         """Terminate the terminal process."""
-        if self.pid:
+        if self.pid and self._exit_status is None:
             try:
                 os.kill(self.pid, signal.SIGTERM)
-                os.waitpid(self.pid, 0)
-            except (ProcessLookupError, ChildProcessError):
+            except ProcessLookupError:
                 pass
+            self._reap(0)
 
         self._running = False
 
         if self.master_fd is not None:
+            self._stop_reading()
+            self._stop_writing()
+            self._write_buffer.clear()
             try:
                 os.close(self.master_fd)
             except OSError:
                 pass
             self.master_fd = None
 
-        if self._read_task and not self._read_task.done():
-            self._read_task.cancel()
-
     async def wait(self) -> int:
         """Wait for the terminal process to complete.
 
@@ -236,8 +496,14 @@ class Terminal:
         if not self.pid:
             return -1
 
-        loop = asyncio.get_event_loop()
-        _, status = await loop.run_in_executor(None, os.waitpid, self.pid, 0)
-
-        self._running = False
-        return os.WEXITSTATUS(status)
+        if self._exit_status is None:
+            loop = asyncio.get_running_loop()
+            self._watch_exit(loop)
+            if self._exit_loop is loop:
+                # Shielded, so a cancelled wait() leaves the watch in place
+                await asyncio.shield(self._exit_future)
+            else:
+                # No pidfd support (non-Linux); block a worker thread instead
+                await loop.run_in_executor(None, self._reap, 0)
+
+        return os.WEXITSTATUS(self._exit_status)
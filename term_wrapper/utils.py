@@ -2,6 +2,36 @@
 
 import re
 
+# Pattern matches all ANSI escape sequences:
+# - CSI (ESC [ ... final byte), tried first as by far the most common
+# - string sequences (OSC window titles and hyperlinks, DCS, SOS, PM, APC),
+#   which run until BEL or ST (ESC \)
+# - other ESC [@-_] sequences, ending at their first final byte
+# - charset selection (ESC ( B) and two-byte escapes (ESC 7, ESC c)
+_ANSI_SOURCE = (
+    r'\x1b(?:\[[0-?]*[ -/]*[@-~]'
+    r'|[\]PX^_][^\x07\x1b]*(?:\x07|\x1b\\)'
+    r'|[@-_][0-?]*[ -/]*[@-~]'
+    r'|[ -/]+[0-~]'
+    r'|[0-?`-~])'
+)
+_ANSI_PATTERN = re.compile(_ANSI_SOURCE)
+
+# Byte-level pattern used when output is matched without decoding
+_ANSI_BYTES_PATTERN = re.compile(_ANSI_SOURCE.encode())
+
+# A trailing escape sequence that is still missing its final byte or terminator
+_ANSI_BYTES_PREFIX = re.compile(rb'\x1b(?:[\]PX^_][^\x07\x1b]*|[@-_][0-?]*[ -/]*|[ -/]+)?\Z')
+
+# An unterminated string sequence, checked when a chunk ends in a bare ESC
+# that may be the first half of its ST terminator, or in an ESC \ that
+# completes it
+_ANSI_BYTES_STRING = re.compile(rb'\x1b[\]PX^_][^\x07\x1b]*')
+
+# Longest unfinished sequence held back; a string sequence that never
+# terminates must not hold back the rest of the output forever
+_MAX_INCOMPLETE = 4096
+
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape sequences from text.
@@ -12,9 +42,50 @@ def strip_ansi(text: str) -> str:
     Returns:
         Clean text with ANSI codes removed
     """
-    # Pattern matches all ANSI escape sequences
-    ansi_pattern = re.compile(r'\x1b[@-_][0-?]*[ -/]*[@-~]')
-    return ansi_pattern.sub('', text)
+    # Plain output is common; a single ESC scan skips the regex entirely
+    if '\x1b' not in text:
+        return text
+    return _ANSI_PATTERN.sub('', text)
+
+
+def strip_ansi_bytes(data: bytes) -> bytes:
+    """Remove ANSI escape sequences from raw bytes.
+
+    Args:
+        data: Bytes containing ANSI escape codes
+
+    Returns:
+        Clean bytes with ANSI codes removed
+    """
+    if b'\x1b' not in data:
+        return data
+    return _ANSI_BYTES_PATTERN.sub(b'', data)
+
+
+def incomplete_ansi_start(data: bytes) -> int:
+    """Find where an unfinished trailing ANSI escape sequence starts.
+
+    Used when stripping output chunk by chunk, so a sequence split across
+    chunks can be held back until the rest of it arrives.
+
+    Args:
+        data: Chunk of terminal output
+
+    Returns:
+        Offset of the incomplete sequence, or len(data) if there is none
+    """
+    esc = data.rfind(b'\x1b')
+    if esc == -1:
+        return len(data)
+    if esc == len(data) - 1 or data[esc + 1] == 0x5c:
+        # The ESC may be the first half of the ST ending an earlier string
+        # sequence, or ESC \ may be that whole ST
+        prev = data.rfind(b'\x1b', max(0, esc - _MAX_INCOMPLETE), esc)
+        if prev != -1 and _ANSI_BYTES_STRING.fullmatch(data, prev, esc):
+            return prev if esc == len(data) - 1 else len(data)
+    if len(data) - esc <= _MAX_INCOMPLETE and _ANSI_BYTES_PREFIX.match(data, esc):
+        return esc
+    return len(data)
 
 
 def extract_visible_text(lines: list[str]) -> str:
@@ -26,5 +97,6 @@ def extract_visible_text(lines: list[str]) -> str:
     Returns:
         Clean text with empty lines removed
     """
-    non_empty_lines = [line.rstrip() for line in lines if line.strip()]
-    return '\n'.join(non_empty_lines)
+    # A line is blank exactly when its rstrip() is empty, so one C-level
+    # rstrip pass both trims and filters
+    return '\n'.join(filter(None, map(str.rstrip, lines)))
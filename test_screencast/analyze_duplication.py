@@ -2,7 +2,9 @@
 """Analyze the exact duplication pattern in visible viewport."""
 
 import asyncio
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, '/home/ai/term_wrapper')
 
 from playwright.async_api import async_playwright
@@ -35,15 +37,19 @@ async def main():
     from PIL import Image
     import pytesseract
 
+    def ocr_frame(frame_num):
+        img_path = f'analysis_frame_{frame_num:04d}.png'
+        # Extract text from image
+        return frame_num, pytesseract.image_to_string(Image.open(img_path))
+
     # Try to use OCR if available
     try:
-        for frame_num in [15, 20, 25, 30, 35]:
-            img_path = f'analysis_frame_{frame_num:04d}.png'
-            img = Image.open(img_path)
-
-            # Extract text from image
-            text = pytesseract.image_to_string(img)
+        # Tesseract runs as a separate process per image, so frames can be
+        # recognized in parallel threads
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(ocr_frame, [15, 20, 25, 30, 35]))
 
+        for frame_num, text in results:
             grooving_count = text.count('Grooving')
             print(f"\nFrame {frame_num}: 'Grooving' appears {grooving_count} times")
 
@@ -2,6 +2,7 @@
 """Re-run screencast with 1fps screenshots to analyze duplication."""
 
 import asyncio
+import itertools
 import sys
 sys.path.insert(0, '/home/ai/term_wrapper')
 
@@ -95,13 +96,18 @@ async def main():
         print("\n=== Typing command (capturing frames) ===")
         command_text = 'write a detailed 50 line explanation of how terminal emulators work'
 
-        for i, char in enumerate(command_text):
-            await page.keyboard.type(char)
-            await asyncio.sleep(0.05)
-
-            # Capture every 10 characters
-            if i % 10 == 0:
-                await capture_frame(f"{i//10}s - typing")
+        async def capture_while_typing():
+            # Every 10 characters at 50 ms per character
+            for i in itertools.count():
+                await capture_frame(f"{i}s - typing")
+                await asyncio.sleep(0.5)
+
+        # Playwright paces the keystrokes itself; frames are captured alongside
+        capture_task = asyncio.create_task(capture_while_typing())
+        try:
+            await page.keyboard.type(command_text, delay=50)
+        finally:
+            capture_task.cancel()
 
         await capture_frame("typing done")
 
@@ -8,6 +8,7 @@ Based on research:
 """
 
 import asyncio
+import os
 import sys
 from pathlib import Path
 sys.path.insert(0, '/home/ai/term_wrapper')
@@ -16,6 +17,9 @@ from playwright.async_api import async_playwright
 from term_wrapper.server_manager import ServerManager
 
 
+# Screenshots don't need a visible window; set HEADLESS=0 to watch a run
+HEADLESS = os.environ.get('HEADLESS', '1') != '0'
+
 # Device configurations based on Playwright best practices 2025
 DEVICES = [
     {
@@ -56,16 +60,6 @@ async def simulate_touch_scroll(page, scroll_type, device_name):
     """
     print(f"\n  Testing {scroll_type} scroll on {device_name}...")
 
-    # Get initial viewport position
-    initial = await page.evaluate("""() => {
-        const term = window.app.term;
-        return {
-            viewportY: term.buffer.active.viewportY,
-            bufferLength: term.buffer.active.length,
-            rows: term.rows
-        };
-    }""")
-
     # Define scroll parameters based on type
     scroll_params = {
         'slow_drag': {'step': 3, 'description': 'Slow drag (3px/step)'},
@@ -76,8 +70,16 @@ async def simulate_touch_scroll(page, scroll_type, device_name):
 
     params = scroll_params[scroll_type]
 
-    # Simulate the swipe
-    result = await page.evaluate(f"""(params) => {{
+    # Read the initial position, simulate the swipe, wait for momentum
+    # scrolling and read the final position in a single browser round-trip
+    measured = await page.evaluate("""async (params) => {
+        const term = window.app.term;
+        const initial = {
+            viewportY: term.buffer.active.viewportY,
+            bufferLength: term.buffer.active.length,
+            rows: term.rows
+        };
+
         const container = document.getElementById('terminal-container');
         const rect = container.getBoundingClientRect();
         const centerX = rect.left + rect.width / 2;
@@ -90,26 +92,26 @@ async def simulate_touch_scroll(page, scroll_type, device_name):
         let moveCount = 0;
         const velocities = [];
 
-        const createTouch = (y) => ({{
+        const createTouch = (y) => ({
             identifier: 0,
             target: container,
             clientX: centerX,
             clientY: y,
             pageX: centerX,
             pageY: y
-        }});
+        });
 
         // Touch start
         let touch = createTouch(currentY);
-        container.dispatchEvent(new TouchEvent('touchstart', {{
+        container.dispatchEvent(new TouchEvent('touchstart', {
             touches: [touch],
             targetTouches: [touch],
             changedTouches: [touch],
             bubbles: true
-        }}));
+        }));
 
         // Collect velocity data during move
-        while (currentY > endY) {{
+        while (currentY > endY) {
             lastY = currentY;
             currentY -= step;
             if (currentY < endY) currentY = endY;
@@ -118,43 +120,58 @@ async def simulate_touch_scroll(page, scroll_type, device_name):
             velocities.push(diff);
 
             touch = createTouch(currentY);
-            container.dispatchEvent(new TouchEvent('touchmove', {{
+            container.dispatchEvent(new TouchEvent('touchmove', {
                 touches: [touch],
                 targetTouches: [touch],
                 changedTouches: [touch],
                 bubbles: true
-            }}));
+            }));
 
             moveCount++;
-        }}
+        }
 
         // Touch end
-        container.dispatchEvent(new TouchEvent('touchend', {{
+        container.dispatchEvent(new TouchEvent('touchend', {
             touches: [],
             targetTouches: [],
             changedTouches: [touch],
             bubbles: true
-        }}));
+        }));
 
-        return {{
+        const result = {
             moveCount,
             totalDistance: startY - endY,
             avgVelocity: velocities.reduce((a, b) => a + b, 0) / velocities.length,
             maxVelocity: Math.max(...velocities)
-        }};
-    }}""", {'step': params['step']})
-
-    # Wait for momentum scrolling to finish
-    await asyncio.sleep(0.5)
+        };
 
-    # Get final position
-    final = await page.evaluate("""() => {
-        const term = window.app.term;
-        return {
+        // Wait for momentum scrolling to finish: the viewport unchanged for
+        // 6 consecutive frames, or 800ms at most
+        await new Promise(resolve => {
+            const deadline = performance.now() + 800;
+            let lastViewportY = term.buffer.active.viewportY;
+            let stableFrames = 0;
+            const check = () => {
+                const viewportY = term.buffer.active.viewportY;
+                stableFrames = viewportY === lastViewportY ? stableFrames + 1 : 0;
+                lastViewportY = viewportY;
+                if (stableFrames >= 6 || performance.now() >= deadline) {
+                    resolve();
+                } else {
+                    requestAnimationFrame(check);
+                }
+            };
+            requestAnimationFrame(check);
+        });
+
+        const final = {
             viewportY: term.buffer.active.viewportY,
             bufferLength: term.buffer.active.length
         };
-    }""")
+
+        return { initial, result, final };
+    }""", {'step': params['step']})
+    initial, result, final = measured['initial'], measured['result'], measured['final']
 
     lines_scrolled = final['viewportY'] - initial['viewportY']
     swipe_distance = result['totalDistance']
@@ -186,94 +203,112 @@ async def simulate_touch_scroll(page, scroll_type, device_name):
     }
 
 
-async def test_device(device_config, server_url, output_dir):
-    """Test scrolling on a specific device."""
-    device_name = device_config['name']
-    print(f"\n{'='*60}")
-    print(f"Testing Device: {device_name}")
-    print(f"{'='*60}")
+async def open_terminal_page(browser, device_config, server_url):
+    """Open a terminal with scrollable content in a new context for the device.
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
+    Returns:
+        Tuple of (context, page)
+    """
+    # Create context with device configuration
+    context = await browser.new_context(
+        viewport=device_config['viewport'],
+        user_agent=device_config['user_agent'],
+        device_scale_factor=device_config['device_scale_factor'],
+        has_touch=device_config['has_touch'],
+    )
 
-        # Create context with device configuration
-        context = await browser.new_context(
-            viewport=device_config['viewport'],
-            user_agent=device_config['user_agent'],
-            device_scale_factor=device_config['device_scale_factor'],
-            has_touch=device_config['has_touch'],
-        )
+    page = await context.new_page()
 
-        page = await context.new_page()
+    # Navigate to term-wrapper with scrollable content
+    await page.goto(f'{server_url}/?cmd=bash&args=-c "seq 1 1000"')
 
-        # Navigate to term-wrapper with scrollable content
-        print(f"Loading terminal with scrollable content...")
-        await page.goto(f'{server_url}/?cmd=bash&args=-c "seq 1 1000"')
+    # Wait for terminal to load and fill with output
+    await page.wait_for_selector('#terminal', timeout=10000)
+    await page.wait_for_function(
+        "() => window.app?.term?.buffer?.active?.length >= 500", timeout=10000
+    )
 
-        # Wait for terminal to load
-        await page.wait_for_selector('#terminal', timeout=10000)
-        await asyncio.sleep(3)
+    return context, page
 
-        # Check version
-        version = await page.evaluate("""() => {
-            return document.getElementById('version')?.textContent || 'not found';
-        }""")
-        print(f"Version: {version}")
 
-        if version != "v0.6.5":
-            print(f"⚠️  WARNING: Expected v0.6.5, got {version}")
+async def run_scroll_type(browser, device_config, scroll_type, server_url, output_dir):
+    """Test one scroll type on a device, in its own context and terminal."""
+    device_name = device_config['name']
+    context, page = await open_terminal_page(browser, device_config, server_url)
+    try:
+        # Reset scroll position
+        await page.evaluate("window.app.term.scrollToTop()")
+        await asyncio.sleep(0.5)
 
-        # Take initial screenshot
-        screenshot_path = output_dir / f"{device_name.replace(' ', '_')}_initial.png"
-        await page.screenshot(path=str(screenshot_path))
-        print(f"Screenshot: {screenshot_path}")
+        # Perform scroll test
+        result = await simulate_touch_scroll(page, scroll_type, device_name)
 
-        # Test all scroll types
-        results = []
-        scroll_types = ['slow_drag', 'medium_swipe', 'fast_flick', 'very_fast']
+        # Take screenshot after scroll
+        screenshot_path = output_dir / f"{device_name.replace(' ', '_')}_{scroll_type}.png"
+        await page.screenshot(path=str(screenshot_path))
+    finally:
+        await context.close()
 
-        for scroll_type in scroll_types:
-            # Reset scroll position
-            await page.evaluate("window.app.term.scrollToTop()")
-            await asyncio.sleep(0.5)
+    print(f"    {device_name}: {result['description']}")
+    print(f"      Lines scrolled: {result['lines_scrolled']}")
+    print(f"      Avg velocity: {result['avg_velocity']:.1f}px")
+    print(f"      Expected multiplier: {result['expected_multiplier']}")
+    print(f"      Actual lines/50px: {result['lines_per_50px']:.1f}")
+    return result
 
-            # Perform scroll test
-            result = await simulate_touch_scroll(page, scroll_type, device_name)
-            results.append(result)
 
-            # Take screenshot after scroll
-            screenshot_path = output_dir / f"{device_name.replace(' ', '_')}_{scroll_type}.png"
-            await page.screenshot(path=str(screenshot_path))
+async def test_device(device_config, browser, server_url, output_dir):
+    """Test scrolling on a specific device."""
+    device_name = device_config['name']
+    print(f"\n{'='*60}")
+    print(f"Testing Device: {device_name}")
+    print(f"{'='*60}")
 
-            print(f"    {result['description']}")
-            print(f"      Lines scrolled: {result['lines_scrolled']}")
-            print(f"      Avg velocity: {result['avg_velocity']:.1f}px")
-            print(f"      Expected multiplier: {result['expected_multiplier']}")
-            print(f"      Actual lines/50px: {result['lines_per_50px']:.1f}")
+    print(f"Loading terminal with scrollable content...")
+    context, page = await open_terminal_page(browser, device_config, server_url)
 
-        # Create sequence of screenshots showing scroll progression
-        print(f"\n  Creating scroll sequence screenshots...")
-        await page.evaluate("window.app.term.scrollToTop()")
-        await asyncio.sleep(0.5)
+    # Check version
+    version = await page.evaluate("""() => {
+        return document.getElementById('version')?.textContent || 'not found';
+    }""")
+    print(f"Version: {version}")
+
+    if version != "v0.6.5":
+        print(f"⚠️  WARNING: Expected v0.6.5, got {version}")
+
+    # Take initial screenshot
+    screenshot_path = output_dir / f"{device_name.replace(' ', '_')}_initial.png"
+    await page.screenshot(path=str(screenshot_path))
+    print(f"Screenshot: {screenshot_path}")
+
+    # Test all scroll types, each in its own context so they run concurrently
+    scroll_types = ['slow_drag', 'medium_swipe', 'fast_flick', 'very_fast']
+    results = await asyncio.gather(*(
+        run_scroll_type(browser, device_config, scroll_type, server_url, output_dir)
+        for scroll_type in scroll_types
+    ))
+
+    # Create sequence of screenshots showing scroll progression
+    print(f"\n  Creating scroll sequence screenshots...")
+    await page.evaluate("window.app.term.scrollToTop()")
+    await asyncio.sleep(0.5)
 
-        # Take screenshots at different scroll positions
-        for i in range(5):
-            screenshot_path = output_dir / f"{device_name.replace(' ', '_')}_sequence_{i}.png"
-            await page.screenshot(path=str(screenshot_path))
+    # Take screenshots at different scroll positions
+    for i in range(5):
+        screenshot_path = output_dir / f"{device_name.replace(' ', '_')}_sequence_{i}.png"
+        await page.screenshot(path=str(screenshot_path))
 
-            if i < 4:  # Don't scroll after last screenshot
-                await simulate_touch_scroll(page, 'fast_flick', device_name)
-                await asyncio.sleep(0.3)
+        if i < 4:  # Don't scroll after last screenshot
+            await simulate_touch_scroll(page, 'fast_flick', device_name)
 
-        await context.close()
-        await browser.close()
+    await context.close()
 
-        return {
-            'device': device_name,
-            'viewport': device_config['viewport'],
-            'version': version,
-            'results': results,
-        }
+    return {
+        'device': device_name,
+        'viewport': device_config['viewport'],
+        'version': version,
+        'results': results,
+    }
 
 
 async def main():
@@ -302,16 +337,25 @@ async def main():
     output_dir.mkdir(exist_ok=True)
     print(f"Output directory: {output_dir}")
 
-    # Test all devices
-    all_results = []
-    for device_config in DEVICES:
+    async def test_device_safe(device_config, browser):
         try:
-            device_results = await test_device(device_config, server_url, output_dir)
-            all_results.append(device_results)
+            return await test_device(device_config, browser, server_url, output_dir)
         except Exception as e:
             print(f"\n❌ ERROR testing {device_config['name']}: {e}")
             import traceback
             traceback.print_exc()
+            return None
+
+    # Test all devices concurrently, each in its own context of one shared browser
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=HEADLESS)
+        try:
+            device_results = await asyncio.gather(
+                *(test_device_safe(d, browser) for d in DEVICES)
+            )
+        finally:
+            await browser.close()
+    all_results = [r for r in device_results if r is not None]
 
     # Generate summary report
     print("\n" + "="*60)
@@ -34,12 +34,22 @@ async def main():
     # Capture raw output with ANSI codes for 30 seconds
     print("\n=== Capturing output for 30 seconds ===\n")
 
+    # Each read returns only the output since the previous one, so every
+    # byte is written once; stop early once output has been quiet for 2s
+    quiet_polls = 0
+    received = False
     with open('claude_ansi_output.txt', 'wb') as f:
         for i in range(60):  # 60 iterations, 0.5s each = 30s total
-            output = client.get_output(session_id, clear=False)
+            output = await client.get_output_bytes_async(session_id, clear=True)
             if output:
-                f.write(output.encode('utf-8'))
+                received = True
+                quiet_polls = 0
+                f.write(output)
                 f.write(b'\n--- CAPTURE AT ' + str(i*0.5).encode() + b's ---\n')
+            elif received:
+                quiet_polls += 1
+                if quiet_polls >= 4:
+                    break
 
             await asyncio.sleep(0.5)
 
@@ -97,6 +107,7 @@ async def main():
     except:
         pass
     client.close()
+    await client.aclose()
 
     print("\n" + "="*60)
     print("ANSI SEQUENCE ANALYSIS COMPLETE")
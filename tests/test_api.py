@@ -2,7 +2,8 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from term_wrapper.api import app, session_manager
+from starlette.websockets import WebSocketDisconnect
+from term_wrapper.api import app, session_manager, TERMINAL_CLOSED_CODE
 import asyncio
 
 
@@ -12,6 +13,17 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def live_client():
+    """Create test client whose requests share one event loop.
+
+    Terminal reads run as a background task on the loop that created the
+    session, so tests consuming output over WebSockets need it to stay alive.
+    """
+    with TestClient(app) as client:
+        yield client
+
+
 @pytest.fixture(autouse=True)
 def cleanup_sessions():
     """Clean up sessions after each test."""
@@ -116,6 +128,22 @@ def test_write_input(client):
     assert response.status_code == 200
 
 
+def test_write_input_raw(client):
+    """Test writing raw input bytes to terminal."""
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+
+    response = client.post(
+        f"/sessions/{session_id}/input_raw",
+        content=b"\x1b[A\xff\n",
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 200
+
+    response = client.post("/sessions/nonexistent/input_raw", content=b"x")
+    assert response.status_code == 404
+
+
 def test_resize_terminal(client):
     """Test resizing terminal."""
     # Create a session
@@ -159,3 +187,262 @@ def test_get_output(client):
     assert "output" in data
     # Just verify we got some output - timing can be tricky with TestClient
     assert len(data["output"]) >= 0  # Output endpoint works
+
+
+def test_get_output_etag(client):
+    """Test ETag / If-None-Match handling on non-clearing output reads."""
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+
+    response = client.get(f"/sessions/{session_id}/output", params={"clear": False, "raw": True})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag == f'"0-{len(response.content)}"'
+
+    # Unchanged buffer returns 304 with an empty body
+    response = client.get(
+        f"/sessions/{session_id}/output",
+        params={"clear": False, "raw": True},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Clearing reads carry no ETag
+    response = client.get(f"/sessions/{session_id}/output")
+    assert "ETag" not in response.headers
+
+
+def test_create_session_return_initial(live_client):
+    """Test creating a session with its first output in the response."""
+    response = live_client.post(
+        "/sessions",
+        json={"command": ["echo", "hello initial"], "return_initial": True},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert "session_id" in data
+    assert "hello initial" in data["initial_output"]
+
+
+def test_stream_output(live_client):
+    """Test the non-consuming output stream WebSocket."""
+    response = live_client.post("/sessions", json={"command": ["sh", "-c", "echo streamed; sleep 0.5"]})
+    session_id = response.json()["session_id"]
+
+    received = b""
+    with live_client.websocket_connect(f"/sessions/{session_id}/stream") as websocket:
+        while b"streamed" not in received:
+            received += websocket.receive_bytes()
+
+    # Streaming does not consume the output buffer
+    response = live_client.get(f"/sessions/{session_id}/output", params={"clear": False})
+    assert "streamed" in response.json()["output"]
+
+
+def test_stream_closes_on_exit(live_client):
+    """Test the stream closes once the terminal exits, and at once for an exited one."""
+    response = live_client.post("/sessions", json={"command": ["sh", "-c", "sleep 0.3; echo bye"]})
+    session_id = response.json()["session_id"]
+
+    for _ in range(2):
+        received = b""
+        with live_client.websocket_connect(f"/sessions/{session_id}/stream") as websocket:
+            with pytest.raises(WebSocketDisconnect):
+                while True:
+                    received += websocket.receive_bytes()
+        assert b"bye" in received
+
+
+def test_get_output_offset(client):
+    """Test non-clearing reads from a stream offset."""
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+    session.add_output(b"hello ")
+    session.add_output(b"world")
+
+    response = client.get(f"/sessions/{session_id}/output",
+                          params={"clear": False, "raw": True, "offset": 8})
+    assert response.content == b"rld"
+    assert response.headers["X-Output-Offset"] == "8"
+    assert response.headers["ETag"] == '"0-11"'
+
+    # Offsets stay valid across clears; stale offsets return the whole buffer
+    client.get(f"/sessions/{session_id}/output")
+    session.add_output(b"again")
+    response = client.get(f"/sessions/{session_id}/output",
+                          params={"clear": False, "raw": True, "offset": 3})
+    assert response.content == b"again"
+    assert response.headers["X-Output-Offset"] == "11"
+    assert response.headers["ETag"] == '"11-16"'
+
+    # A base from before the clear also gets the whole buffer
+    response = client.get(f"/sessions/{session_id}/output",
+                          params={"clear": False, "raw": True, "offset": 13, "base": 0})
+    assert response.content == b"again"
+
+
+def test_output_buffer_limit(client, monkeypatch):
+    """Test the oldest output is dropped once the buffer limit is reached."""
+    import term_wrapper.session_manager as session_manager_module
+    monkeypatch.setattr(session_manager_module, "OUTPUT_BUFFER_LIMIT", 8)
+
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+    session.add_output(b"hello ")
+    session.add_output(b"world")
+
+    response = client.get(f"/sessions/{session_id}/output", params={"clear": False, "raw": True})
+    assert response.content == b"lo world"
+    assert response.headers["ETag"] == '"3-11"'
+
+
+def test_screen_split_utf8(client):
+    """Test a character split across output chunks renders intact on the screen."""
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+    encoded = "héllo".encode()
+    session.add_output(encoded[:2])
+    session.add_output(encoded[2:])
+
+    response = client.get(f"/sessions/{session_id}/screen")
+    assert response.json()["lines"][0] == "héllo"
+
+
+def test_screen_odd_sequence_mid_batch(client):
+    """Test an odd escape sequence in a pending batch doesn't drop the output around it."""
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+    session.add_output(b"before ")
+    session.add_output(b"\x1b[1;2Amiddle \x1b[?1;2A")
+    session.add_output(b"after")
+
+    response = client.get(f"/sessions/{session_id}/screen")
+    assert response.json()["lines"][0] == "before middle after"
+
+
+def test_screen_replays_earlier_output(client, monkeypatch):
+    """Test output from before the first screen read is rendered on that read."""
+    import term_wrapper.session_manager as session_manager_module
+    monkeypatch.setattr(session_manager_module, "SCREEN_REPLAY_LIMIT", 8)
+
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+    session.add_output(b"hello ")
+    session.add_output(b"world")
+    # Output is consumed elsewhere before the screen is first requested
+    client.get(f"/sessions/{session_id}/output")
+
+    # Pending output past the limit is rendered, not dropped
+    response = client.get(f"/sessions/{session_id}/screen")
+    assert response.json()["lines"][0] == "hello world"
+
+    session.add_output(b"!")
+    response = client.get(f"/sessions/{session_id}/screen")
+    assert response.json()["lines"][0] == "hello world!"
+
+    session.add_output(b" more output")
+    response = client.get(f"/sessions/{session_id}/screen")
+    assert response.json()["lines"][0] == "hello world! more output"
+
+
+@pytest.mark.parametrize("with_clear", [False, True])
+@pytest.mark.parametrize("chunk_size", [None, 7])
+def test_screen_replay_past_limit(client, monkeypatch, with_clear, chunk_size):
+    """Test the first screen read after more than SCREEN_REPLAY_LIMIT of output."""
+    import term_wrapper.session_manager as session_manager_module
+    from term_wrapper.screen_buffer import ScreenBuffer
+    monkeypatch.setattr(session_manager_module, "SCREEN_REPLAY_LIMIT", 64)
+
+    chunks = ["\x1b[1;1Htop row stays\r\n".encode()]
+    for i in range(40):
+        chunks.append(f"\x1b[{i % 20 + 2};3H\x1b[31mline {i} é\x1b[0m\r\n".encode())
+        if with_clear and i == 30:
+            chunks.append(b"\x1b[H\x1b[2J")
+    output = b"".join(chunks)
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+    if chunk_size:
+        # Batches rendered at the limit then split escape sequences and characters
+        chunks = [output[pos:pos + chunk_size] for pos in range(0, len(output), chunk_size)]
+    for chunk in chunks:
+        session.add_output(chunk)
+    assert len(session._screen_pending) <= 64
+
+    expected = ScreenBuffer(24, 80)
+    expected.process_output(output.decode())
+    response = client.get(f"/sessions/{session_id}/screen")
+    assert response.json()["lines"] == expected.get_screen_lines()
+    assert ("top row stays" in response.json()["lines"][0]) is not with_clear
+
+
+def test_stream_drops_stalled_subscriber(client):
+    """Test that a subscriber that stops reading is dropped, not buffered forever."""
+    from term_wrapper.session_manager import STREAM_QUEUE_LIMIT
+
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session = session_manager.get_session(response.json()["session_id"])
+    _, queue = session.subscribe()
+
+    for _ in range(STREAM_QUEUE_LIMIT):
+        session.add_output(b"x")
+    assert queue in session.listeners
+    session.add_output(b"x")
+    assert queue not in session.listeners
+    # Queued output is replaced by the signal to close the stream
+    assert queue.get_nowait() is None
+    assert queue.empty()
+
+
+def test_wait_for_quiet(client):
+    """Test the server-side quiet wait."""
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+
+    response = client.get(f"/sessions/{session_id}/quiet", params={"duration": 0.2, "timeout": 2})
+    assert response.json() == {"quiet": True}
+
+    # Fresh output restarts the quiet period
+    session.add_output(b"busy")
+    response = client.get(f"/sessions/{session_id}/quiet", params={"duration": 5, "timeout": 0.2})
+    assert response.json() == {"quiet": False}
+
+
+def test_get_screen_etag(client):
+    """Test screen reads return 304 until output changes the screen."""
+    response = client.post("/sessions", json={"command": ["cat"]})
+    session_id = response.json()["session_id"]
+    session = session_manager.get_session(session_id)
+
+    response = client.get(f"/sessions/{session_id}/screen")
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/sessions/{session_id}/screen", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    session.add_output(b"changed")
+    response = client.get(f"/sessions/{session_id}/screen", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "changed" in response.json()["lines"][0]
+
+
+def test_websocket_close_code_on_exit(live_client):
+    """Test /ws closes with the terminal-closed code when the process exits."""
+    response = live_client.post("/sessions", json={"command": ["sh", "-c", "echo bye"]})
+    session_id = response.json()["session_id"]
+
+    received = b""
+    with live_client.websocket_connect(f"/sessions/{session_id}/ws") as websocket:
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            while True:
+                received += websocket.receive_bytes()
+    assert exc_info.value.code == TERMINAL_CLOSED_CODE
+    assert b"bye" in received
@@ -1,10 +1,11 @@
 """Unit tests for CLI client."""
 
+import os
 import pytest
 import time
 from multiprocessing import Process
 import uvicorn
-from term_wrapper.cli import TerminalClient
+from term_wrapper.cli import TerminalClient, MIN_POLL_INTERVAL, _next_interval, _writev_all, _TextStream
 import httpx
 
 
@@ -56,6 +57,63 @@ def client(server):
     client.close()
 
 
+def test_ws_url_base():
+    """Test WebSocket URL derivation from the base URL."""
+    assert TerminalClient("http://localhost:8000")._ws_url_base == "ws://localhost:8000"
+    assert TerminalClient("https://example.com/term/")._ws_url_base == "wss://example.com/term"
+
+
+def test_next_interval():
+    """Test adaptive poll interval grows when idle and resets on change."""
+    assert _next_interval(MIN_POLL_INTERVAL, False, 0.5) == pytest.approx(MIN_POLL_INTERVAL * 1.5)
+    assert _next_interval(0.45, False, 0.5) == 0.5
+    assert _next_interval(0.5, True, 0.5) == MIN_POLL_INTERVAL
+
+
+def test_writev_all():
+    """Test batched writes preserve order and skip empty buffers."""
+    read_fd, write_fd = os.pipe()
+    try:
+        _writev_all(write_fd, [b"abc", b"", b"def", b"\x1b[0m"])
+        assert os.read(read_fd, 100) == b"abcdef\x1b[0m"
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_writev_all_full_nonblocking_pipe():
+    """Test writes to a full non-blocking fd resume once it drains."""
+    import threading
+
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+    # Fill the pipe so the first writev hits EAGAIN after a partial write
+    filler = b"f" * 4096
+    try:
+        while True:
+            os.write(write_fd, filler)
+    except BlockingIOError:
+        pass
+
+    received = bytearray()
+
+    def drain():
+        time.sleep(0.1)
+        while chunk := os.read(read_fd, 65536):
+            received.extend(chunk)
+
+    reader = threading.Thread(target=drain)
+    reader.start()
+    buffers = [bytes([65 + i]) * 100_000 for i in range(5)]
+    try:
+        _writev_all(write_fd, buffers)
+    finally:
+        os.close(write_fd)
+        reader.join(timeout=5)
+        os.close(read_fd)
+    assert bytes(received).lstrip(b"f") == b"".join(buffers)
+
+
 def test_create_session(client):
     """Test creating a session via TerminalClient."""
     session_id = client.create_session(command=["echo", "test"], rows=24, cols=80)
@@ -119,6 +177,305 @@ def test_get_output(client):
     client.delete_session(session_id)
 
 
+def test_get_output_bytes(client):
+    """Test getting raw terminal output bytes."""
+    session_id = client.create_session(
+        command=["sh", "-c", "echo 'test output'; sleep 0.5"]
+    )
+
+    time.sleep(1)
+    output = client.get_output_bytes(session_id, clear=False)
+
+    assert isinstance(output, bytes)
+    assert b"test output" in output
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_get_output_bytes_incremental(client):
+    """Test non-clearing reads only fetch output added since the last read."""
+    session_id = client.create_session(command=["cat"])
+
+    client.write_input(session_id, "one\n")
+    client.wait_for_text(session_id, "one", timeout=5)
+    first = client.get_output_bytes(session_id, clear=False)
+    assert b"one" in first
+    etag = client._output_caches[session_id].etag
+
+    # Unchanged buffer: served from the cache after a 304
+    assert client.get_output_bytes(session_id, clear=False) == first
+    assert client._output_caches[session_id].etag == etag
+
+    client.write_input(session_id, "two\n")
+    client.wait_for_text(session_id, "two", timeout=5)
+    assert client.get_output(session_id, clear=False).startswith(first.decode())
+
+    # Consuming the buffer restarts the cache
+    client.get_output(session_id, clear=True)
+    client.write_input(session_id, "three\n")
+    client.wait_for_text(session_id, "three", timeout=5)
+    output = client.get_output_bytes(session_id, clear=False)
+    assert b"three" in output and b"one" not in output
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_wait_for_bytes(client):
+    """Test waiting for bytes in ANSI-stripped output."""
+    session_id = client.create_session(
+        command=["sh", "-c", "printf '\\033[31mready\\033[0m\\n'; sleep 1"]
+    )
+
+    assert client.wait_for_bytes(session_id, b"ready", timeout=5, poll_interval=0.1)
+    assert client.wait_for_text(session_id, "ready", timeout=5, poll_interval=0.1)
+
+    with pytest.raises(TimeoutError):
+        client.wait_for_text(session_id, "never printed", timeout=0.3, poll_interval=0.1)
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_wait_for_condition_and_quiet(client):
+    """Test condition and quiet waits driven by pushed output."""
+    session_id = client.create_session(
+        command=["sh", "-c", "for i in 1 2 3; do echo tick-$i; sleep 0.2; done; sleep 5"]
+    )
+
+    assert client.wait_for_condition(session_id, lambda text: "tick-2" in text, timeout=5)
+    start = time.monotonic()
+    assert client.wait_for_quiet(session_id, duration=0.5, timeout=5)
+    assert time.monotonic() - start >= 0.5
+    assert "tick-3" in client.get_text(session_id)
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_wait_for_condition_multibyte(client):
+    """Test condition waits see multi-byte characters decoded across pushed frames."""
+    session_id = client.create_session(
+        command=["sh", "-c", "printf 'h\\303'; sleep 0.2; printf '\\251llo\\n'; sleep 5"]
+    )
+
+    assert client.wait_for_condition(session_id, lambda text: "héllo" in text, timeout=5)
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_wait_for_quiet_poll_interval_deprecated(client):
+    """Test passing wait_for_quiet's ignored poll_interval warns."""
+    session_id = client.create_session(command=["echo", "quiet"])
+
+    with pytest.warns(DeprecationWarning, match="poll_interval"):
+        assert client.wait_for_quiet(session_id, duration=0.1, poll_interval=0.5, timeout=5)
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_wait_for_text_after_exit(client):
+    """Test that a wait fails fast once the session stops producing output."""
+    session_id = client.create_session(command=["echo", "bye"])
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError, match="before the session ended"):
+        client.wait_for_text(session_id, "never printed", timeout=10)
+    with pytest.raises(TimeoutError, match="before the session ended"):
+        client.wait_for_condition(session_id, lambda text: "never printed" in text, timeout=10)
+    assert time.monotonic() - start < 5
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_wait_for_text_polling_fallback(client):
+    """Test waits fall back to HTTP polling when the stream is unavailable."""
+    session_id = client.create_session(command=["sh", "-c", "echo fallback; sleep 1"])
+
+    # Point the WebSocket side at a closed port
+    client._ws_url_base = "ws://127.0.0.1:1"
+    assert client.wait_for_text(session_id, "fallback", timeout=5, poll_interval=0.1)
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_sync_waits_share_event_loop(client):
+    """Test that sync waits reuse one event loop and async HTTP client."""
+    session_id = client.create_session(command=["sh", "-c", "sleep 0.3; echo first; echo second; sleep 1"])
+
+    # Use the HTTP polling path so the async HTTP client is exercised
+    client._ws_url_base = "ws://127.0.0.1:1"
+    assert client.wait_for_text(session_id, "first", timeout=5, poll_interval=0.1)
+    loop, http_client = client._loop, client._async_http_client
+    assert http_client is not None
+    assert client.wait_for_text(session_id, "second", timeout=5, poll_interval=0.1)
+    assert client._loop is loop
+    assert client._async_http_client is http_client
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_sync_wait_inside_running_loop(client):
+    """Test that sync waits work when called from inside an event loop."""
+    import asyncio
+
+    session_id = client.create_session(command=["sh", "-c", "sleep 0.3; echo inside; sleep 1"])
+
+    async def wait_inside():
+        return client.wait_for_text(session_id, "inside", timeout=5, poll_interval=0.1)
+
+    assert asyncio.run(wait_inside())
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_sync_waits_from_threads(client):
+    """Test concurrent sync waits on one client from separate threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    session_ids = [
+        client.create_session(command=["sh", "-c", f"sleep 0.3; echo thread-{i}; sleep 1"])
+        for i in range(2)
+    ]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(client.wait_for_text, sid, f"thread-{i}", timeout=5, poll_interval=0.1)
+            for i, sid in enumerate(session_ids)
+        ]
+        assert [future.result() for future in futures] == [True, True]
+
+    # Cleanup
+    for sid in session_ids:
+        client.delete_session(sid)
+
+
+def test_wait_for_text_async_parallel(client):
+    """Test several async waits sharing one event loop."""
+    import asyncio
+
+    session_ids = [
+        client.create_session(command=["sh", "-c", f"sleep 0.3; echo done-{i}; sleep 1"])
+        for i in range(3)
+    ]
+
+    async def wait_all():
+        try:
+            return await asyncio.gather(*(
+                client.wait_for_text_async(sid, f"done-{i}", timeout=5, poll_interval=0.1)
+                for i, sid in enumerate(session_ids)
+            ))
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(wait_all()) == [True, True, True]
+
+    # Cleanup
+    for sid in session_ids:
+        client.delete_session(sid)
+
+
+def test_async_http_client_closed_with_its_loop(client):
+    """Test an async client left open by asyncio.run() is closed with its loop."""
+    import asyncio
+
+    session_id = client.create_session(command=["sh", "-c", "echo looped; sleep 1"])
+    client._ws_url_base = "ws://127.0.0.1:1"  # Poll, so the async HTTP client is used
+
+    async def wait():
+        await client.wait_for_text_async(session_id, "looped", timeout=5, poll_interval=0.1)
+        return client._async_http_client
+
+    first = asyncio.run(wait())
+    assert first.is_closed
+    second = asyncio.run(wait())
+    assert second is not first and second.is_closed
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_get_text_incremental(client):
+    """Test get_text only fetches and strips new output between calls."""
+    session_id = client.create_session(command=["cat"])
+
+    client.write_input(session_id, "\x1b[31mone\x1b[0m\n")
+    client.wait_for_text(session_id, "one", timeout=5)
+    assert "one" in client.get_text(session_id)
+    first_end = client._text_caches[session_id].end
+
+    client.write_input(session_id, "two\n")
+    client.wait_for_text(session_id, "two", timeout=5)
+    text = client.get_text(session_id)
+    assert "one" in text and "two" in text
+    assert "\x1b" not in text
+    assert client._text_caches[session_id].end > first_end
+
+    # Consuming the buffer restarts the cache from the remaining output
+    client.get_output(session_id, clear=True)
+    client.write_input(session_id, "three\n")
+    client.wait_for_text(session_id, "three", timeout=5)
+    text = client.get_text(session_id)
+    assert "three" in text and "one" not in text
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_get_new_lines(client):
+    """Test reading only lines added since the last read mark."""
+    session_id = client.create_session(command=["cat"])
+
+    client.mark_read(session_id)
+    assert client.get_new_lines(session_id) == []
+
+    client.write_input(session_id, "first\n")
+    client.wait_for_text(session_id, "first", timeout=5, poll_interval=0.1)
+    assert "first" in "\n".join(client.get_new_lines(session_id))
+
+    client.write_input(session_id, "second\n")
+    client.wait_for_text(session_id, "second", timeout=5, poll_interval=0.1)
+    new_text = "\n".join(client.get_new_lines(session_id))
+    assert "second" in new_text
+    assert "first" not in new_text
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
+def test_text_stream_split_sequences():
+    """Test that escapes and characters split between chunks are held back."""
+    stream = _TextStream()
+    chunks = [b"ok \x1b[3", b"1mred... \xc3", b"\xa9"]
+    assert [stream.feed(chunk) for chunk in chunks] == ["ok ", "red... ", "\u00e9"]
+
+
+def test_get_new_lines_split_output(client):
+    """Test get_new_lines when an escape and a character span two reads."""
+    session_id = client.create_session(command=[
+        "sh", "-c",
+        "printf 'ok \\033[3'; sleep 0.4; printf '1mred \\303'; sleep 0.4; printf '\\251\\n'; sleep 5",
+    ])
+
+    text = ""
+    deadline = time.monotonic() + 5
+    while "\u00e9" not in text and time.monotonic() < deadline:
+        text += "\n".join(client.get_new_lines(session_id))
+        time.sleep(0.1)
+    assert "ok red \u00e9" in text
+    assert "\x1b" not in text and "\ufffd" not in text
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
 def test_get_screen(client):
     """Test getting parsed screen buffer."""
     # Create session with simple output
@@ -159,6 +516,23 @@ def test_get_screen(client):
     client.delete_session(session_id)
 
 
+def test_get_screen_cached(client):
+    """Test that an unchanged screen is served from the client cache."""
+    session_id = client.create_session(command=["cat"], rows=10, cols=40)
+    client.write_input(session_id, "hello\n")
+    client.wait_for_text(session_id, "hello", timeout=5)
+
+    first = client.get_screen(session_id)
+    assert client.get_screen(session_id) is first
+
+    client.write_input(session_id, "again\n")
+    client.wait_for_text(session_id, "again", timeout=5)
+    assert any("again" in line for line in client.get_screen(session_id)["lines"])
+
+    # Cleanup
+    client.delete_session(session_id)
+
+
 def test_get_screen_with_ansi_codes(client):
     """Test that get_screen handles ANSI codes properly."""
     # Create session with ANSI color codes
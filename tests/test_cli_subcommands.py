@@ -1,5 +1,6 @@
 """Unit tests for CLI subcommands."""
 
+import io
 import json
 import sys
 from unittest.mock import Mock, patch, MagicMock
@@ -112,7 +113,7 @@ def test_cli_send_input():
                 sync_main()
 
                 # Check that escape sequences were processed
-                mock_instance.write_input.assert_called_once_with("test-123", "hello\nworld")
+                mock_instance.write_input_bytes.assert_called_once_with("test-123", b"hello\nworld")
 
 
 def test_cli_send_input_with_enter():
@@ -125,7 +126,7 @@ def test_cli_send_input_with_enter():
                 from term_wrapper.cli import sync_main
                 sync_main()
 
-                mock_instance.write_input.assert_called_once_with("test-123", "ls\r")
+                mock_instance.write_input_bytes.assert_called_once_with("test-123", b"ls\r")
 
 
 def test_cli_get_output():
@@ -335,6 +336,25 @@ def test_cli_generic_error():
                 assert exc.value.code == 1
 
 
+def test_cli_attach_task_group_error():
+    """Test CLI reports the underlying errors of a failed attach task group."""
+    with mock_cli_environment() as (MockClient, _):
+        mock_instance = MockClient.return_value
+
+        async def fail(session_id):
+            raise ExceptionGroup("unhandled errors in a TaskGroup", [OSError("stdin gone")])
+
+        mock_instance.interactive_session.side_effect = fail
+
+        with patch("sys.argv", ["term-wrapper", "attach", "test-123"]):
+            with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                from term_wrapper.cli import sync_main
+                with pytest.raises(SystemExit) as exc:
+                    sync_main()
+                assert exc.value.code == 1
+                assert json.loads(stderr.getvalue()) == {"error": "stdin gone"}
+
+
 def test_cli_web():
     """Test 'web' subcommand opens browser with existing session ID."""
     with mock_cli_environment() as (MockClient, MockServerManager):
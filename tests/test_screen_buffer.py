@@ -11,8 +11,8 @@ def test_screen_buffer_init():
     assert buffer.cols == 80
     assert buffer.cursor_row == 0
     assert buffer.cursor_col == 0
-    assert len(buffer.screen) == 24
-    assert len(buffer.screen[0]) == 80
+    assert len(buffer.screen) == 24 * 80
+    assert buffer.get_screen_lines() == [""] * 24
 
 
 def test_write_simple_text():
@@ -124,6 +124,18 @@ def test_clear_screen():
         assert line == ""
 
 
+def test_clear_to_end_of_screen():
+    """Test clear from cursor to end of screen."""
+    buffer = ScreenBuffer(4, 20)
+    buffer.process_output("Line 1\nLine 2\nLine 3\nLine 4")
+    screen = buffer.screen
+    buffer.process_output("\x1b[2;3H\x1b[J")
+
+    assert buffer.get_screen_lines() == ["Line 1", "Li", "", ""]
+    # Clears reuse the existing grid
+    assert buffer.screen is screen
+
+
 def test_clear_line_to_end():
     """Test clear line from cursor to end."""
     buffer = ScreenBuffer(5, 20)
@@ -137,6 +149,18 @@ def test_clear_line_to_end():
     assert lines[0] == "Hello"
 
 
+def test_clear_line_to_start():
+    """Test clear line from start to cursor."""
+    buffer = ScreenBuffer(5, 20)
+    buffer.process_output("Hello World")
+    buffer.move_cursor(0, 5)
+    # Clear from start of line through the cursor
+    buffer.process_output("\x1b[1K")
+
+    lines = buffer.get_screen_lines()
+    assert lines[0] == "      World"
+
+
 def test_clear_entire_line():
     """Test clear entire line."""
     buffer = ScreenBuffer(5, 20)
@@ -200,6 +224,16 @@ def test_screen_wrapping():
     assert lines[1] == "ABCDEF"
 
 
+def test_screen_wrapping_bottom_row():
+    """Test long runs keep overwriting the bottom row instead of scrolling."""
+    buffer = ScreenBuffer(2, 5)
+    buffer.process_output("abcdefghijklmn")
+
+    lines = buffer.get_screen_lines()
+    assert lines == ["abcde", "klmnj"]
+    assert (buffer.cursor_row, buffer.cursor_col) == (1, 4)
+
+
 def test_tab_character():
     """Test tab character handling."""
     buffer = ScreenBuffer(5, 40)
@@ -236,6 +270,23 @@ def test_save_and_restore_cursor():
     assert lines[0][5] == "X"
 
 
+def test_screen_lines_cache_invalidation():
+    """Test cached screen lines reflect writes and clears between reads."""
+    buffer = ScreenBuffer(3, 20)
+    buffer.process_output("Line 1\nLine 2")
+    assert buffer.get_screen_lines() == ["Line 1", "Line 2", ""]
+
+    # Returned lists are copies of the cache
+    buffer.get_screen_lines()[0] = "changed"
+    assert buffer.get_screen_lines()[0] == "Line 1"
+
+    buffer.process_output("\x1b[1;1HX")
+    assert buffer.get_screen_lines() == ["Xine 1", "Line 2", ""]
+
+    buffer.process_output("\x1b[2J")
+    assert buffer.get_screen_lines() == ["", "", ""]
+
+
 def test_get_screen_text():
     """Test get_screen_text method."""
     buffer = ScreenBuffer(3, 20)
@@ -245,6 +296,16 @@ def test_get_screen_text():
     assert text == "Line 1\nLine 2\nLine 3"
 
 
+def test_get_screen_text_padded():
+    """Test get_screen_text_padded keeps every row at full width."""
+    buffer = ScreenBuffer(3, 8)
+    buffer.process_output("Line 1\nLine 2")
+
+    text = buffer.get_screen_text_padded()
+    assert text == "Line 1  \nLine 2  \n        "
+    assert [line.rstrip() for line in text.split("\n")] == buffer.get_screen_lines()
+
+
 def test_multiple_processes():
     """Test parsing multiple process lines like in htop."""
     buffer = ScreenBuffer(30, 150)
@@ -270,3 +331,34 @@ def test_multiple_processes():
     for i in range(5):
         assert f"process-{i}" in lines[i + 1]
         assert f"{1000 + i}" in lines[i + 1]
+
+
+def test_non_ascii_characters():
+    """Test box-drawing and other non-ASCII characters are kept per cell."""
+    buffer = ScreenBuffer(3, 10)
+    buffer.process_output("┌─é─┐\n│日本│")
+
+    lines = buffer.get_screen_lines()
+    assert lines[0] == "┌─é─┐"
+    assert lines[1] == "│日本│"
+
+
+def test_skipped_escape_sequences():
+    """Test non-CSI escapes are skipped and truncated CSI params are kept as text."""
+    buffer = ScreenBuffer(5, 40)
+    buffer.process_output("\x1b(BA\x1b=B\x1b?25hC\x1b[?1049hD\x1b[1")
+
+    lines = buffer.get_screen_lines()
+    assert lines[0] == "ABCD1"
+
+
+def test_odd_csi_parameters():
+    """Test modifier-style and malformed CSI parameters don't stop the rest of the output."""
+    buffer = ScreenBuffer(5, 20)
+    buffer.process_output("abc\x1b[1;2Adef\x1b[?3Cghi\x1b[;3Hj\x1b[1;5Dk")
+
+    lines = buffer.get_screen_lines()
+    # Only the first parameter is used; a non-numeric one falls back to 1
+    assert lines[0] == "abkdef ghi"
+    assert buffer.cursor_row == 0
+    assert buffer.cursor_col == 3
@@ -0,0 +1,123 @@
+"""Tests for server manager module."""
+
+import os
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import pytest
+from term_wrapper.server_manager import ServerManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Create a server manager whose state lives in a temporary home."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    manager = ServerManager()
+    manager.state_dir.mkdir()
+    return manager
+
+
+def test_state_dir_created_lazily(tmp_path, monkeypatch):
+    """Test the state directory is not created until a server is started."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    manager = ServerManager()
+    assert manager._discover_server() is None
+    assert manager.stop_server()["status"] == "not_running"
+    assert not manager.state_dir.exists()
+
+
+def test_discover_server(manager):
+    """Test auto-discovery reads the port file and checks the server."""
+    assert manager._discover_server() is None
+
+    manager.port_file.write_text("12345")
+    with patch.object(manager, "_is_server_running", return_value=True) as running:
+        assert manager._discover_server() == "http://localhost:12345"
+    running.assert_called_once_with("http://localhost:12345")
+
+    with patch.object(manager, "_is_server_running", return_value=False):
+        assert manager._discover_server() is None
+
+    # Partially written or garbage port files are treated as missing
+    manager.port_file.write_text("")
+    assert manager._discover_server() is None
+
+
+def test_get_server_url_cached(manager):
+    """Test a discovered URL is reused without another health check."""
+    manager.port_file.write_text("12345")
+    with patch.object(manager, "_is_server_running", return_value=True) as running:
+        assert manager.get_server_url() == "http://localhost:12345"
+        assert manager.get_server_url() == "http://localhost:12345"
+    assert running.call_count == 1
+
+    # Stale entries are checked again
+    manager._cached_at -= 60
+    with patch.object(manager, "_is_server_running", return_value=True) as running:
+        manager.get_server_url()
+    assert running.call_count == 1
+
+    # So are entries whose port file was rewritten
+    manager.port_file.write_text("23456")
+    os.utime(manager.port_file, ns=(0, 0))
+    with patch.object(manager, "_is_server_running", return_value=True) as running:
+        assert manager.get_server_url() == "http://localhost:23456"
+    assert running.call_count == 1
+
+
+def test_discover_fresh_server_skips_health_check(manager):
+    """Test a just-started server with a live PID is trusted without a probe."""
+    manager.port_file.write_text("12345")
+    manager.pid_file.write_text(str(os.getpid()))
+    with patch.object(manager, "_is_server_running", return_value=False) as running:
+        assert manager._discover_server() == "http://localhost:12345"
+    running.assert_not_called()
+
+    # Older state files are checked again
+    old = time.time() - 60
+    os.utime(manager.pid_file, (old, old))
+    with patch.object(manager, "_is_server_running", return_value=False) as running:
+        assert manager._discover_server() is None
+    running.assert_called_once()
+
+
+def test_stop_server(manager):
+    """Test stopping returns as soon as the server process exits."""
+    process = subprocess.Popen(["sleep", "30"])
+    manager.pid_file.write_text(str(process.pid))
+    manager.port_file.write_text("12345")
+
+    # The process stays an unreaped zombie of ours until process.wait()
+    start = time.monotonic()
+    result = manager.stop_server()
+    assert time.monotonic() - start < 1
+    process.wait()
+    assert result["status"] == "stopped"
+    assert not manager.pid_file.exists()
+    assert not manager.port_file.exists()
+
+
+def test_is_server_running(manager):
+    """Test the health probe against a live and a missing server."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/health" else 404)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert manager._is_server_running(f"http://localhost:{port}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert not manager._is_server_running(f"http://localhost:{port}")
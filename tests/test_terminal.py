@@ -2,6 +2,8 @@
 
 import asyncio
 import pytest
+import time
+from term_wrapper import terminal as terminal_module
 from term_wrapper.terminal import Terminal
 
 
@@ -107,3 +109,178 @@ async def test_terminal_multiple_outputs():
     assert "line1" in output
     assert "line2" in output
     assert "line3" in output
+
+
+@pytest.mark.asyncio
+async def test_terminal_stops_reading_on_exit():
+    """Test reading stops once the process exits and its output is drained."""
+    terminal = Terminal()
+    outputs = []
+    terminal.output_callback = outputs.append
+    terminal.spawn(["sh", "-c", "echo done"])
+
+    await terminal.start_reading()
+    assert terminal.is_reading()
+
+    for _ in range(50):
+        if not terminal.is_reading():
+            break
+        await asyncio.sleep(0.1)
+
+    assert not terminal.is_reading()
+    assert b"done" in b"".join(outputs)
+    terminal.kill()
+
+
+@pytest.mark.asyncio
+async def test_terminal_large_write():
+    """Test input larger than the PTY buffer is delivered completely."""
+    terminal = Terminal()
+    outputs = []
+    terminal.output_callback = outputs.append
+    terminal.spawn(["sh", "-c", "head -c 200000 | wc -c"])
+    await terminal.start_reading()
+
+    terminal.write(b"x" * 200000)
+
+    for _ in range(50):
+        if b"200000" in b"".join(outputs):
+            break
+        await asyncio.sleep(0.1)
+
+    terminal.kill()
+    assert b"200000" in b"".join(outputs)
+
+
+def test_terminal_large_write_without_loop():
+    """Test a write the PTY cannot take at once blocks when no event loop runs."""
+    terminal = Terminal()
+    terminal.spawn(["sh", "-c", "head -c 200000 > /dev/null; sleep 5"])
+
+    terminal.write(b"x" * 200000)
+    assert not terminal._write_buffer
+    # Later writes are not stuck behind a queued tail
+    terminal.write(b"more")
+    assert not terminal._write_buffer
+    terminal.kill()
+
+
+@pytest.mark.asyncio
+async def test_terminal_write_buffer_limit(monkeypatch):
+    """Test input for a process that never reads it is bounded."""
+    monkeypatch.setattr(terminal_module, "WRITE_BUFFER_LIMIT", 300000)
+    terminal = Terminal()
+    terminal.spawn(["sleep", "10"])
+    await terminal.start_reading()
+
+    terminal.write(b"x" * 200000)
+    assert terminal._write_buffer
+    with pytest.raises(BlockingIOError):
+        terminal.write(b"y" * 200000)
+    assert len(terminal._write_buffer) <= 300000
+    terminal.kill()
+
+
+@pytest.mark.asyncio
+async def test_terminal_single_write_over_limit(monkeypatch):
+    """Test one write larger than WRITE_BUFFER_LIMIT is refused rather than queued."""
+    monkeypatch.setattr(terminal_module, "WRITE_BUFFER_LIMIT", 100000)
+    terminal = Terminal()
+    terminal.spawn(["sleep", "10"])
+    await terminal.start_reading()
+
+    with pytest.raises(BlockingIOError) as excinfo:
+        terminal.write(b"x" * 200000)
+    assert excinfo.value.characters_written < 200000
+    assert not terminal._write_buffer
+    terminal.kill()
+
+
+def test_terminal_blocking_write_timeout(monkeypatch):
+    """Test a write without an event loop gives up on a process that never reads."""
+    monkeypatch.setattr(terminal_module, "BLOCKING_WRITE_TIMEOUT", 0.2)
+    terminal = Terminal()
+    terminal.spawn(["sleep", "10"])
+
+    start = time.monotonic()
+    with pytest.raises(BlockingIOError):
+        terminal.write(b"x" * 200000)
+    assert time.monotonic() - start < 5
+    terminal.kill()
+
+
+@pytest.mark.asyncio
+async def test_terminal_wait_exit_code():
+    """Test wait returns the exit code of the process."""
+    terminal = Terminal()
+    terminal.spawn(["sh", "-c", "sleep 0.2; exit 3"])
+
+    assert await asyncio.wait_for(terminal.wait(), timeout=5) == 3
+    assert not terminal.is_alive()
+    terminal.kill()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_posix_spawn", [True, False])
+async def test_terminal_spawn_env_and_missing_command(monkeypatch, use_posix_spawn):
+    """Test extra environment variables reach the process and bad commands raise."""
+    monkeypatch.setattr(terminal_module, "_USE_POSIX_SPAWN", use_posix_spawn)
+    terminal = Terminal()
+    outputs = []
+    terminal.output_callback = outputs.append
+    terminal.spawn(["sh", "-c", "echo $TW_TEST_VAR"], env={"TW_TEST_VAR": "from-env"})
+    await terminal.start_reading()
+    await asyncio.sleep(0.3)
+    terminal.kill()
+    assert b"from-env" in b"".join(outputs)
+
+    with pytest.raises(RuntimeError, match="failed to start"):
+        Terminal().spawn(["term-wrapper-no-such-command"])
+
+
+@pytest.mark.asyncio
+async def test_terminal_drains_pending_output():
+    """Test output pending in the PTY is delivered in one chunk, not per 4 KiB read."""
+    terminal = Terminal()
+    outputs = []
+    terminal.output_callback = outputs.append
+    terminal.spawn(["sh", "-c", "head -c 20000 /dev/zero | tr '\\0' x; sleep 1"])
+    await asyncio.sleep(0.5)
+
+    await terminal.start_reading()
+    await asyncio.sleep(0.2)
+    terminal.kill()
+    assert len(outputs[0]) == 20000
+
+
+@pytest.mark.asyncio
+async def test_terminal_script_without_shebang(tmp_path):
+    """Test executable scripts without a shebang run through bash."""
+    script = tmp_path / "script"
+    script.write_text("echo from-script\n")
+    script.chmod(0o755)
+
+    for _ in range(2):  # The second spawn uses the cached probe result
+        terminal = Terminal()
+        outputs = []
+        terminal.output_callback = outputs.append
+        terminal.spawn([str(script)])
+        await terminal.start_reading()
+        await asyncio.sleep(0.3)
+        terminal.kill()
+        assert b"from-script" in b"".join(outputs)
+
+
+@pytest.mark.asyncio
+async def test_terminal_exit_watched_by_loop():
+    """Test the event loop reaps an exited process, so is_alive and wait agree."""
+    terminal = Terminal()
+    terminal.spawn(["sh", "-c", "sleep 0.2; exit 5"])
+    await terminal.start_reading()
+    assert terminal.is_alive()
+
+    await asyncio.sleep(0.5)
+    # Reaped by the loop already; neither call needs waitpid
+    assert not terminal.is_alive()
+    assert await asyncio.wait_for(terminal.wait(), timeout=1) == 5
+    terminal.kill()
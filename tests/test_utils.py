@@ -0,0 +1,59 @@
+"""Tests for terminal output utilities."""
+
+from term_wrapper.utils import strip_ansi, strip_ansi_bytes, incomplete_ansi_start, extract_visible_text
+
+
+def test_strip_ansi():
+    """Test removing ANSI sequences from text."""
+    assert strip_ansi("\x1b[31mRed\x1b[0m text") == "Red text"
+    assert strip_ansi("plain") == "plain"
+
+
+def test_strip_ansi_string_sequences():
+    """Test removing OSC strings, charset selection and two-byte escapes."""
+    text = "\x1b]0;title\x07$ \x1b]8;;http://x\x1b\\link\x1b]8;;\x1b\\ \x1b(B\x1b[mok\x1b7\x1bOP"
+    assert strip_ansi(text) == "$ link ok"
+    assert strip_ansi_bytes(text.encode()) == b"$ link ok"
+
+
+def test_strip_ansi_bytes():
+    """Test removing ANSI sequences from raw bytes."""
+    assert strip_ansi_bytes(b"\x1b[1;32mok\x1b[0m\r\n") == b"ok\r\n"
+    assert strip_ansi_bytes(b"plain") == b"plain"
+
+
+def test_incomplete_ansi_start():
+    """Test detecting an escape sequence cut off at the end of a chunk."""
+    assert incomplete_ansi_start(b"text\x1b[3") == 4
+    assert incomplete_ansi_start(b"text\x1b") == 4
+    assert incomplete_ansi_start(b"text\x1b[31m") == 9
+    assert incomplete_ansi_start(b"\x1b(Bhello") == 8
+    assert incomplete_ansi_start(b"plain") == 5
+    # Unterminated OSC strings, including one cut inside its ESC \ terminator
+    assert incomplete_ansi_start(b"ab\x1b]0;tit") == 2
+    assert incomplete_ansi_start(b"ab\x1b]0;title\x1b") == 2
+    assert incomplete_ansi_start(b"ab\x1b]0;title\x07") == 12
+    # A chunk ending in the ESC \ that closes a string sequence is complete
+    assert incomplete_ansi_start(b"ab\x1b]0;title\x1b\\") == 13
+
+
+def test_incomplete_ansi_start_chunked_stripping():
+    """Test that stripping split chunks matches stripping the whole output."""
+    whole = b"see \x1b]8;;http://x\x1b\\link\x1b]8;;\x1b\\ end \x1b]0;t\x07\x1b[31mred\x1b[0m"
+    for split in range(len(whole) + 1):
+        for split2 in range(split, len(whole) + 1):
+            held = b""
+            stripped = b""
+            for chunk in (whole[:split], whole[split:split2], whole[split2:]):
+                data = held + chunk
+                cut = incomplete_ansi_start(data)
+                held = data[cut:]
+                stripped += strip_ansi_bytes(data[:cut])
+            assert stripped + strip_ansi_bytes(held) == strip_ansi_bytes(whole), (split, split2)
+
+
+def test_extract_visible_text():
+    """Test that blank lines are dropped and trailing spaces trimmed."""
+    lines = ["first   ", "", "   ", "  indented", "last"]
+    assert extract_visible_text(lines) == "first\n  indented\nlast"
+    assert extract_visible_text([" ", ""]) == ""